@@ -2,15 +2,28 @@
 import asyncio
 import argparse
 from datetime import datetime, timedelta
+from typing import List
 
 from trading_bot.core import TradingEngine
 from trading_bot.strategies import get_strategy
 from trading_bot.backtesting import BacktestEngine
-from trading_bot.utils import setup_logger, DataFetcher
-from trading_bot.config.settings import settings
+from trading_bot.utils import setup_logger, CandleCache, DataFetcher
+from trading_bot.config.settings import get_settings
 from trading_bot.exchanges import create_exchange
 
+# libuv-based event loop where available (not on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def run(coro):
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 async def run_live_trading():
+    settings = get_settings()
     setup_logger(level=settings.log_level, log_file="trading_bot/logs/trading.log")
     
     engine = TradingEngine()
@@ -37,17 +50,18 @@ async def run_live_trading():
         await engine.stop()
         print("✅ Trading engine stopped")
 
-async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
+async def run_backtest(strategy_name: str, symbols: List[str], days: int = 30):
     setup_logger(level="INFO")
     
-    print(f"🔍 Running backtest for {strategy_name} on {symbol}")
+    print(f"🔍 Running backtest for {strategy_name} on {', '.join(symbols)}")
     
     # Initialize exchange for data fetching
+    settings = get_settings()
     if not settings.exchanges:
         print("❌ No exchanges configured. Please set up API keys.")
         return
     
-    exchange_name = list(settings.exchanges.keys())[0]
+    exchange_name = next(iter(settings.exchanges))
     exchange_config = settings.exchanges[exchange_name]
     
     exchange = create_exchange(
@@ -58,24 +72,39 @@ async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
     )
     
     # Fetch historical data
-    data_fetcher = DataFetcher(exchange)
+    cache = CandleCache.from_url(settings.database.url) if settings.database.cache_candles else None
+    data_fetcher = DataFetcher(exchange, cache)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
     print(f"📈 Fetching data from {start_date.date()} to {end_date.date()}")
     
-    market_data = await data_fetcher.fetch_historical_data(
-        symbol=symbol,
-        timeframe="1h",
-        start_date=start_date,
-        end_date=end_date
-    )
+    # Fetch all symbols concurrently, bounded by the exchange rate limit
+    semaphore = asyncio.Semaphore(exchange_config.rate_limit)
+    
+    async def fetch(symbol: str):
+        async with semaphore:
+            return await data_fetcher.fetch_historical_data(
+                symbol=symbol,
+                timeframe="1h",
+                start_date=start_date,
+                end_date=end_date
+            )
+    
+    try:
+        results = await asyncio.gather(*[fetch(symbol) for symbol in symbols])
+    finally:
+        await exchange.close()
+        if cache is not None:
+            cache.close()
+    market_data = {symbol: data for symbol, data in zip(symbols, results) if data}
     
     if not market_data:
         print("❌ No market data found")
         return
     
-    print(f"✅ Fetched {len(market_data)} data points")
+    for symbol, data in market_data.items():
+        print(f"✅ Fetched {len(data)} data points for {symbol}")
     
     # Initialize strategy
     if strategy_name == "ma_crossover":
@@ -91,7 +120,7 @@ async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
     
     result = backtest_engine.run_backtest(
         strategy=strategy,
-        market_data={symbol: market_data},
+        market_data=market_data,
         start_date=start_date,
         end_date=end_date
     )
@@ -101,7 +130,7 @@ async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
     print("📊 BACKTEST RESULTS")
     print("="*50)
     print(f"Strategy: {strategy_name}")
-    print(f"Symbol: {symbol}")
+    print(f"Symbols: {', '.join(market_data)}")
     print(f"Period: {result.start_date.date()} to {result.end_date.date()} ({result.duration_days} days)")
     print(f"\\nPerformance:")
     print(f"  Initial Balance: ${result.initial_balance:,.2f}")
@@ -109,6 +138,10 @@ async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
     print(f"  Total Return: ${result.total_return:,.2f} ({result.total_return_pct:.2f}%)")
     print(f"  Max Drawdown: ${result.max_drawdown:,.2f} ({result.max_drawdown_pct:.2f}%)")
     print(f"  Sharpe Ratio: {result.sharpe_ratio:.2f}")
+    print(f"  Sortino Ratio: {result.sortino_ratio:.2f}")
+    print(f"  Calmar Ratio: {result.calmar_ratio:.2f}")
+    print(f"  Annualized Return: {result.annualized_return_pct:.2f}%")
+    print(f"  Annualized Volatility: {result.annualized_volatility_pct:.2f}%")
     print(f"\\nTrade Statistics:")
     print(f"  Total Trades: {result.total_trades}")
     print(f"  Winning Trades: {result.winning_trades}")
@@ -119,14 +152,9 @@ async def run_backtest(strategy_name: str, symbol: str, days: int = 30):
     print(f"  Profit Factor: {result.profit_factor:.2f}")
     
     # Show recent trades
-    if result.trades:
+    if result.total_trades:
         print(f"\\nRecent Trades (last 5):")
-        for trade in result.trades[-5:]:
-            pnl_emoji = "🟢" if trade['pnl'] >= 0 else "🔴"
-            print(f"  {pnl_emoji} {trade['side'].upper()} {trade['symbol']} | "
-                  f"Entry: ${trade['entry_price']:.4f} | "
-                  f"Exit: ${trade['exit_price']:.4f} | "
-                  f"P&L: ${trade['pnl']:.2f} ({trade['return_pct']:.2f}%)")
+        print(result.format_recent(5))
 
 def main():
     parser = argparse.ArgumentParser(description="Trading Bot")
@@ -140,17 +168,17 @@ def main():
     backtest_parser.add_argument('--strategy', required=True, 
                                choices=['ma_crossover', 'rsi'],
                                help='Strategy to backtest')
-    backtest_parser.add_argument('--symbol', required=True,
-                                help='Symbol to backtest (e.g., BTC/USDT)')
+    backtest_parser.add_argument('--symbol', required=True, nargs='+',
+                                help='Symbols to backtest (e.g., BTC/USDT ETH/USDT)')
     backtest_parser.add_argument('--days', type=int, default=30,
                                 help='Number of days to backtest (default: 30)')
     
     args = parser.parse_args()
     
     if args.command == 'live':
-        asyncio.run(run_live_trading())
+        run(run_live_trading())
     elif args.command == 'backtest':
-        asyncio.run(run_backtest(args.strategy, args.symbol, args.days))
+        run(run_backtest(args.strategy, args.symbol, args.days))
     else:
         parser.print_help()
 
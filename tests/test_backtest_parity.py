@@ -0,0 +1,70 @@
+import math
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from trading_bot.backtesting import BacktestEngine
+from trading_bot.strategies.base import MarketData
+from trading_bot.strategies.ma_crossover import MACrossoverStrategy
+
+# The vectorized backtest path must trade exactly like the per-bar analyze() loop
+
+def synthetic_bars(symbol: str, n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    price = 100.0
+    start = datetime(2024, 1, 1)
+    bars = []
+    for i in range(n):
+        open_ = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.01) + 0.003 * math.sin(i / 15)))
+        bars.append(MarketData(symbol, start + timedelta(hours=i), open_, max(open_, price) * 1.002,
+                               min(open_, price) * 0.998, price, rng.uniform(10, 100)))
+    return bars
+
+class PerBarMACrossover(MACrossoverStrategy):
+    # Same strategy with the batch path disabled, forcing the per-bar loop
+    def analyze_batch_symbols(self, arrays):
+        return None
+
+class BacktestParityTest(unittest.TestCase):
+    def setUp(self):
+        logger.disable('trading_bot')
+    
+    def tearDown(self):
+        logger.enable('trading_bot')
+    
+    def run_backtest(self, strategy, seeds: tuple, n: int = 2000):
+        data = {
+            'BTC/USDT': synthetic_bars('BTC/USDT', n, seeds[0]),
+            'ETH/USDT': synthetic_bars('ETH/USDT', n, seeds[1])
+        }
+        start = datetime(2024, 1, 1)
+        return BacktestEngine().run_backtest(strategy, data, start, start + timedelta(hours=n))
+    
+    def test_batch_and_per_bar_paths_trade_alike(self):
+        # These series close positions on crosses the RSI filter keeps from
+        # opening new ones, which exposes stale strategy positions
+        for seeds in [(1, 11), (3, 13)]:
+            with self.subTest(seeds=seeds):
+                self.assert_same_trades(seeds)
+    
+    def assert_same_trades(self, seeds: tuple):
+        batch = self.run_backtest(MACrossoverStrategy(fast_period=10, slow_period=20), seeds)
+        per_bar = self.run_backtest(PerBarMACrossover(fast_period=10, slow_period=20), seeds)
+        
+        self.assertGreater(len(batch.trades), 0)
+        self.assertEqual(len(batch.trades), len(per_bar.trades))
+        for expected, actual in zip(per_bar.trades, batch.trades):
+            self.assertEqual(expected['symbol'], actual['symbol'])
+            self.assertEqual(expected['side'], actual['side'])
+            self.assertEqual(expected['entry_time'], actual['entry_time'])
+            self.assertEqual(expected['exit_time'], actual['exit_time'])
+            self.assertAlmostEqual(expected['size'], actual['size'], places=9)
+            self.assertAlmostEqual(expected['entry_price'], actual['entry_price'], places=9)
+            self.assertAlmostEqual(expected['exit_price'], actual['exit_price'], places=9)
+        self.assertAlmostEqual(batch.final_balance, per_bar.final_balance, places=6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import talib
+
+from trading_bot.strategies.base import MarketData
+from trading_bot.strategies.indicators import (StreamingSMA, StreamingEMA, StreamingRSI,
+                                               StreamingMACD, StreamingBollinger)
+from trading_bot.strategies.indicator_cache import IndicatorCache
+from trading_bot.strategies.rsi_strategy import _RSIStream
+
+# Streaming indicators fed the same bars as talib must give talib's readings;
+# the strategies rely on that when they replay a window into fresh state
+
+def random_walk(n: int, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+
+def stream(indicator, values: np.ndarray, *fields: str) -> list:
+    readings = [[] for _ in fields]
+    for x in values:
+        indicator.update(float(x))
+        for out, field in zip(readings, fields):
+            out.append(getattr(indicator, field))
+    return [np.array(out) for out in readings]
+
+class StreamingIndicatorTest(unittest.TestCase):
+    def assert_matches(self, actual: np.ndarray, expected: np.ndarray):
+        # Compared wherever talib has a reading; warm-up lengths may differ
+        ready = ~np.isnan(expected)
+        self.assertTrue(ready.any())
+        self.assertFalse(np.isnan(actual[ready]).any())
+        np.testing.assert_allclose(actual[ready], expected[ready], rtol=1e-9, atol=1e-9)
+    
+    def test_sma(self):
+        close = random_walk(300)
+        (value,) = stream(StreamingSMA(10), close, 'value')
+        self.assert_matches(value, talib.SMA(close, timeperiod=10))
+    
+    def test_ema(self):
+        close = random_walk(300)
+        (value,) = stream(StreamingEMA(12), close, 'value')
+        self.assert_matches(value, talib.EMA(close, timeperiod=12))
+    
+    def test_rsi(self):
+        close = random_walk(300)
+        (value,) = stream(StreamingRSI(14), close, 'value')
+        self.assert_matches(value, talib.RSI(close, timeperiod=14))
+    
+    def test_macd(self):
+        close = random_walk(300)
+        value, signal = stream(StreamingMACD(), close, 'value', 'signal')
+        macd, macd_signal, _ = talib.MACD(close)
+        self.assert_matches(value, macd)
+        self.assert_matches(signal, macd_signal)
+    
+    def test_bollinger(self):
+        close = random_walk(300)
+        upper, middle, lower = stream(StreamingBollinger(), close, 'upper', 'middle', 'lower')
+        bb_upper, bb_middle, bb_lower = talib.BBANDS(close)
+        self.assert_matches(upper, bb_upper)
+        self.assert_matches(middle, bb_middle)
+        self.assert_matches(lower, bb_lower)
+
+class RSIStreamTest(unittest.TestCase):
+    def test_replayed_window_matches_talib(self):
+        # The 100-bar window the engines hand to analyze()
+        close = random_walk(100, seed=3)
+        start = datetime(2024, 1, 1)
+        state = _RSIStream('BTC/USDT', 14, IndicatorCache())
+        for i, x in enumerate(close):
+            state.update(MarketData('BTC/USDT', start + timedelta(hours=i), x, x + 1.0, x - 1.0, x, 50.0))
+        
+        rsi = talib.RSI(close, timeperiod=14)
+        macd, macd_signal, _ = talib.MACD(close)
+        bb_upper, _, bb_lower = talib.BBANDS(close)
+        self.assertAlmostEqual(state.rsi.value, rsi[-1], places=9)
+        self.assertAlmostEqual(state.prev_rsi, rsi[-2], places=9)
+        self.assertAlmostEqual(state.macd.value, macd[-1], places=9)
+        self.assertAlmostEqual(state.macd.signal, macd_signal[-1], places=9)
+        self.assertAlmostEqual(state.bollinger.upper, bb_upper[-1], places=9)
+        self.assertAlmostEqual(state.bollinger.lower, bb_lower[-1], places=9)
+
+if __name__ == '__main__':
+    unittest.main()
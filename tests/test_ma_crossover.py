@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from trading_bot.strategies.base import MarketData, SignalType, BUY, SELL
+from trading_bot.strategies.ma_crossover import MACrossoverStrategy, _crossover_codes
+
+# The vectorized crossover kernels must agree with each other and with the
+# per-bar analyze() they replace in backtests
+
+def random_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+
+def to_bars(symbol: str, close: np.ndarray) -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        MarketData(symbol, start + timedelta(hours=i), x, x * 1.002, x * 0.998, x, 50.0)
+        for i, x in enumerate(close.tolist())
+    ]
+
+class CrossoverKernelTest(unittest.TestCase):
+    def test_packed_symbols_match_per_symbol_kernel(self):
+        # Different lengths so every symbol has its own offsets in the packed buffer
+        strategy = MACrossoverStrategy(fast_period=10, slow_period=20)
+        arrays = {
+            f'SYM{seed}/USDT': {'close': random_walk(n, seed)}
+            for seed, n in [(1, 1500), (2, 700), (3, 1200)]
+        }
+        packed = strategy.analyze_batch_symbols(arrays)
+        
+        self.assertEqual(set(packed), set(arrays))
+        for symbol, symbol_arrays in arrays.items():
+            expected = strategy.analyze_batch(symbol, symbol_arrays)
+            self.assertEqual(len(packed[symbol]), len(symbol_arrays['close']))
+            np.testing.assert_array_equal(packed[symbol], expected)
+            self.assertTrue(np.isin(expected, [BUY, SELL]).any())
+    
+    def test_codes_match_analyze_without_position(self):
+        strategy = MACrossoverStrategy(fast_period=10, slow_period=20)
+        symbol = 'BTC/USDT'
+        close = random_walk(600, 4)
+        codes = strategy.analyze_batch(symbol, {'close': close})
+        
+        # With no position open, analyze() acts only on crosses the RSI filter
+        # lets through; the exit codes for blocked crosses have nothing to close
+        expected_types = {BUY: SignalType.BUY, SELL: SignalType.SELL}
+        for i, bar in enumerate(to_bars(symbol, close)):
+            strategy.on_bar(symbol, bar)
+            signal = strategy.analyze(symbol, strategy.get_market_data(symbol))
+            with self.subTest(bar=i):
+                self.assertEqual(signal.signal_type, expected_types.get(int(codes[i]), SignalType.HOLD))
+    
+    def test_sweep_matches_kernel_per_pair(self):
+        # The cumsum SMAs and talib RSI of the sweep must track the fused kernel
+        close = random_walk(2000, 5)
+        fast_periods = [5, 8, 10]
+        slow_periods = [20, 26, 30]
+        codes = MACrossoverStrategy.sweep_signals(close, fast_periods, slow_periods)
+        
+        self.assertEqual(codes.shape, (len(close), len(fast_periods), len(slow_periods)))
+        for i, fast in enumerate(fast_periods):
+            for j, slow in enumerate(slow_periods):
+                with self.subTest(fast=fast, slow=slow):
+                    np.testing.assert_array_equal(codes[:, i, j], _crossover_codes(close, fast, slow))
+
+if __name__ == '__main__':
+    unittest.main()
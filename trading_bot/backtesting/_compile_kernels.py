@@ -0,0 +1,22 @@
+"""
+Ahead-of-time build of the backtest kernels.
+
+Run ``python -m trading_bot.backtesting._compile_kernels`` to produce the
+``backtest_kernels`` extension module next to this file. ``_kernels`` imports
+it when present, which skips the JIT compile on the first backtest of every
+process; without it the kernels are compiled lazily with ``@njit``.
+"""
+import os
+
+from numba.pycc import CC
+
+from ._kernels import _stats_impl, _equity_impl
+
+cc = CC('backtest_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('stats', 'UniTuple(f8, 7)(f8[:])')(_stats_impl)
+cc.export('equity', 'f8(f8, i1[:], f8[:], f8[:], f8[:])')(_equity_impl)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,71 @@
+import numpy as np
+
+from ..utils._njit import njit
+
+def _stats_impl(equity: np.ndarray):
+    # Drawdown plus log-return metrics, annualized with 252 periods, in one pass
+    n = equity.shape[0]
+    max_dd = 0.0
+    max_dd_pct = 0.0
+    if n == 0:
+        return max_dd, max_dd_pct, 0.0, 0.0, 0.0, 0.0, 0.0
+    
+    peak = equity[0]
+    ret_sum = 0.0
+    ret_sum_sq = 0.0
+    neg_sum_sq = 0.0
+    m = 0
+    
+    for i in range(1, n):
+        # Log returns are undefined once the account is wiped out
+        if equity[i] > 0.0 and equity[i - 1] > 0.0:
+            r = np.log(equity[i] / equity[i - 1])
+            ret_sum += r
+            ret_sum_sq += r * r
+            if r < 0.0:
+                neg_sum_sq += r * r
+            m += 1
+        
+        if equity[i] > peak:
+            peak = equity[i]
+        else:
+            dd = peak - equity[i]
+            if dd > max_dd:
+                max_dd = dd
+            if peak > 0.0 and dd / peak > max_dd_pct:
+                max_dd_pct = dd / peak
+    
+    sharpe = 0.0
+    sortino = 0.0
+    calmar = 0.0
+    annual_return = 0.0
+    annual_vol = 0.0
+    if m > 0:
+        mean = ret_sum / m
+        var = ret_sum_sq / m - mean * mean
+        if var > 0.0:
+            annual_vol = np.sqrt(var) * np.sqrt(252.0)
+            sharpe = mean * 252.0 / annual_vol
+        downside = np.sqrt(neg_sum_sq / m)
+        if downside > 0.0:
+            sortino = mean / downside * np.sqrt(252.0)
+        annual_return = np.exp(mean * 252.0) - 1.0 if equity[n - 1] > 0.0 else -1.0
+        if max_dd_pct > 0.0:
+            calmar = annual_return / max_dd_pct
+    
+    return max_dd, max_dd_pct * 100, sharpe, sortino, calmar, annual_return * 100, annual_vol * 100
+
+def _equity_impl(balance: float, side: np.ndarray, size: np.ndarray,
+            entry_price: np.ndarray, last_price: np.ndarray) -> float:
+    total = balance
+    for i in range(side.shape[0]):
+        if side[i] != 0:
+            total += side[i] * (last_price[i] - entry_price[i]) * size[i]
+    return total
+
+# Prefer the ahead-of-time build from _compile_kernels.py; fall back to JIT
+try:
+    from .backtest_kernels import stats as _stats, equity as _equity
+except ImportError:
+    _stats = njit(cache=True)(_stats_impl)
+    _equity = njit(cache=True)(_equity_impl)
@@ -2,11 +2,31 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import cached_property
 import numpy as np
 from loguru import logger
 
 from ..strategies.base import BaseStrategy, TradingSignal, SignalType, MarketData
 from ..exchanges.base import Order, Position, OrderSide, OrderType, OrderStatus
+from ._kernels import _stats, _equity
+
+# Signal type bitmasks for branch checks on the hot path
+_OPEN_MASK = (1 << SignalType.BUY) | (1 << SignalType.SELL)
+_CLOSE_MASK = (1 << SignalType.CLOSE_LONG) | (1 << SignalType.CLOSE_SHORT)
+
+# Closed trade record layout; side is +1 long / -1 short, timestamps are epoch ns
+TRADE_DTYPE = np.dtype([
+    ('symbol_id', 'i4'),
+    ('side', 'i1'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('size', 'f8'),
+    ('entry_ts', 'i8'),
+    ('exit_ts', 'i8'),
+    ('pnl', 'f8'),
+    ('return_pct', 'f8')
+])
+INITIAL_TRADE_CAPACITY = 256
 
 @dataclass
 class BacktestResult:
@@ -17,6 +37,10 @@ class BacktestResult:
     max_drawdown: float
     max_drawdown_pct: float
     sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+    annualized_return_pct: float
+    annualized_volatility_pct: float
     total_trades: int
     winning_trades: int
     losing_trades: int
@@ -27,58 +51,168 @@ class BacktestResult:
     start_date: datetime
     end_date: datetime
     duration_days: int
-    trades: List[Dict]
-    equity_curve: List[Tuple[datetime, float]]
+    trade_log: np.ndarray
+    symbols: List[str]
+    equity: np.ndarray
+    equity_timestamps: np.ndarray
+    
+    @cached_property
+    def trades(self) -> List[Dict]:
+        log = self.trade_log
+        return [
+            {
+                'symbol': self.symbols[symbol_id],
+                'side': 'long' if side > 0 else 'short',
+                'entry_price': entry_price,
+                'exit_price': exit_price,
+                'size': size,
+                'entry_time': entry_time,
+                'exit_time': exit_time,
+                'pnl': pnl,
+                'return_pct': return_pct
+            }
+            for symbol_id, side, entry_price, exit_price, size, entry_time, exit_time, pnl, return_pct in zip(
+                log['symbol_id'].tolist(), log['side'].tolist(),
+                log['entry_price'].tolist(), log['exit_price'].tolist(), log['size'].tolist(),
+                log['entry_ts'].astype('datetime64[ns]').astype('datetime64[us]').tolist(),
+                log['exit_ts'].astype('datetime64[ns]').astype('datetime64[us]').tolist(),
+                log['pnl'].tolist(), log['return_pct'].tolist()
+            )
+        ]
+    
+    def format_recent(self, n: int = 5) -> str:
+        recent = self.trade_log[-n:] if n > 0 else self.trade_log[:0]
+        return "\n".join(
+            f"  {'🟢' if pnl >= 0 else '🔴'} {'LONG' if side > 0 else 'SHORT'} {self.symbols[symbol_id]} | "
+            f"Entry: ${entry_price:.4f} | "
+            f"Exit: ${exit_price:.4f} | "
+            f"P&L: ${pnl:.2f} ({return_pct:.2f}%)"
+            for symbol_id, side, entry_price, exit_price, pnl, return_pct in zip(
+                recent['symbol_id'].tolist(), recent['side'].tolist(),
+                recent['entry_price'].tolist(), recent['exit_price'].tolist(),
+                recent['pnl'].tolist(), recent['return_pct'].tolist()
+            )
+        )
+    
+    @cached_property
+    def equity_curve(self) -> List[Tuple[datetime, float]]:
+        return list(zip(self.equity_timestamps.astype('datetime64[us]').tolist(), self.equity.tolist()))
 
 class BacktestEngine:
     def __init__(self, initial_balance: float = 10000.0, commission: float = 0.001):
         self.initial_balance = initial_balance
         self.commission = commission
+        self._one_plus_commission = 1.0 + commission
+        self._one_minus_commission = 1.0 - commission
         self.reset()
     
     def reset(self):
         self.balance = self.initial_balance
         self.positions: Dict[str, Position] = {}
         self.open_orders: Dict[str, Order] = {}
-        self.closed_trades: List[Dict] = []
-        self.equity_curve: List[Tuple[datetime, float]] = []
+        self._trades = np.empty(INITIAL_TRADE_CAPACITY, dtype=TRADE_DTYPE)
+        self._n_trades = 0
+        self._equity = np.empty(0, dtype=np.float64)
+        self._equity_ts = np.empty(0, dtype='datetime64[ns]')
+        self._allocate_position_arrays({})
         self.current_timestamp = None
-        self.peak_balance = self.initial_balance
-        self.max_drawdown = 0.0
+        self._current_ts_ns = 0
+        self._strategy: Optional[BaseStrategy] = None
+    
+    def _allocate_position_arrays(self, symbol_ids: Dict[str, int]):
+        # Open position state per dense symbol id: side is +1 long, -1 short, 0 flat
+        n_symbols = len(symbol_ids)
+        self._symbol_ids = symbol_ids
+        self._symbol_names = list(symbol_ids)
+        self._pos_side = np.zeros(n_symbols, dtype=np.int8)
+        self._pos_size = np.zeros(n_symbols, dtype=np.float64)
+        self._pos_entry = np.zeros(n_symbols, dtype=np.float64)
+        self._pos_entry_ts = np.zeros(n_symbols, dtype=np.int64)
+        self._last_price = np.zeros(n_symbols, dtype=np.float64)
         
     def run_backtest(self, strategy: BaseStrategy, market_data: Dict[str, List[MarketData]], 
                     start_date: datetime, end_date: datetime) -> BacktestResult:
         logger.info(f"Starting backtest for {strategy.name} from {start_date} to {end_date}")
         
         self.reset()
+        self._strategy = strategy
         
-        # Filter market data by date range
+        # Convert each symbol's bars to struct-of-arrays once and cut the date
+        # range out of the sorted timestamps with two binary searches
+        start_ts = np.datetime64(start_date, 'ns')
+        end_ts = np.datetime64(end_date, 'ns')
         filtered_data = {}
+        soa = {}
         for symbol, data in market_data.items():
-            filtered_data[symbol] = [
-                d for d in data 
-                if start_date <= d.timestamp <= end_date
-            ]
+            arrays = self._to_soa(data)
+            ts = arrays['ts']
+            if np.any(ts[1:] < ts[:-1]):
+                order = np.argsort(ts, kind='stable')
+                arrays = {key: values[order] for key, values in arrays.items()}
+                data = [data[j] for j in order]
+            
+            lo = int(np.searchsorted(arrays['ts'], start_ts, side='left'))
+            hi = int(np.searchsorted(arrays['ts'], end_ts, side='right'))
+            filtered_data[symbol] = data[lo:hi]
+            if hi > lo:
+                soa[symbol] = {key: values[lo:hi] for key, values in arrays.items()}
         
-        if not any(filtered_data.values()):
+        if not soa:
             raise ValueError("No market data found in the specified date range")
         
         # Get all unique timestamps and sort them
-        all_timestamps = set()
-        for data_list in filtered_data.values():
-            all_timestamps.update(d.timestamp for d in data_list)
+        sorted_timestamps = self._merge_timestamps([arrays['ts'] for arrays in soa.values()])
+        timestamp_objects = sorted_timestamps.astype('datetime64[us]').tolist()
         
-        sorted_timestamps = sorted(all_timestamps)
+        # Cursor of every symbol at every tick, resolved in one vectorized pass per symbol
+        tick_cursors = {
+            symbol: np.searchsorted(arrays['ts'], sorted_timestamps, side='right')
+            for symbol, arrays in soa.items()
+        }
+        cursors: Dict[str, int] = {symbol: 0 for symbol in soa}
+        self._allocate_position_arrays({symbol: sid for sid, symbol in enumerate(filtered_data)})
+        symbol_ids = self._symbol_ids
+        last_price = self._last_price
+        
+        # One equity sample per tick, so the timeline doubles as the equity timestamps
+        self._equity = np.empty(len(sorted_timestamps), dtype=np.float64)
+        self._equity_ts = sorted_timestamps
+        tick_ns = sorted_timestamps.view(np.int64)
+        
+        # Pure strategies evaluate their whole history at once; the tick loop
+        # then only simulates fills for the precomputed signals
+        batch_signals = strategy.analyze_batch_symbols(soa)
+        if batch_signals is not None:
+            batch_signals = {symbol: signals.tolist() for symbol, signals in batch_signals.items()}
+            logger.info(f"Using vectorized signals from {strategy.name}")
+            self._walk_signals(strategy, batch_signals, soa, tick_cursors, cursors, timestamp_objects, tick_ns)
+            return self._generate_result(start_date, end_date)
+        
+        on_bar = strategy.on_bar
+        pos_side = self._pos_side
+        symbol_names = self._symbol_names
+        open_positions = self.positions
         
         # Process each timestamp
-        for timestamp in sorted_timestamps:
-            self.current_timestamp = timestamp
+        for i, (timestamp, current_timestamp) in enumerate(zip(sorted_timestamps, timestamp_objects)):
+            self.current_timestamp = current_timestamp
+            self._current_ts_ns = tick_ns[i]
             
-            # Update market data for strategy
-            for symbol, data_list in filtered_data.items():
-                current_data = [d for d in data_list if d.timestamp <= timestamp]
-                if current_data:
-                    strategy.add_market_data(symbol, current_data[-100:])  # Keep last 100 candles
+            # Stream each bar reached since the previous tick into the strategy
+            for symbol, positions in tick_cursors.items():
+                cursor = int(positions[i])
+                previous = cursors[symbol]
+                if cursor > previous:
+                    for bar in filtered_data[symbol][previous:cursor]:
+                        on_bar(symbol, bar)
+                    cursors[symbol] = cursor
+                    last_price[symbol_ids[symbol]] = soa[symbol]['close'][cursor - 1]
+            
+            # Update current positions in strategy, visiting only symbols with a
+            # nonzero side instead of probing the dict for every symbol
+            for sid in np.flatnonzero(pos_side):
+                symbol = symbol_names[sid]
+                strategy.update_position(symbol, open_positions[symbol])
             
             # Process signals for each symbol
             for symbol in filtered_data.keys():
@@ -86,176 +220,224 @@ class BacktestEngine:
                 if len(symbol_data) < 20:  # Need minimum data for analysis
                     continue
                 
-                # Update current positions in strategy
-                if symbol in self.positions:
-                    strategy.update_position(symbol, self.positions[symbol])
-                
                 # Get trading signal
                 signal = strategy.analyze(symbol, symbol_data)
                 
-                if signal.signal_type != SignalType.HOLD:
+                if signal.signal_type is not SignalType.HOLD:
                     self._process_signal(signal, symbol_data[-1])
             
             # Update equity curve
-            current_equity = self._calculate_total_equity(filtered_data)
-            self.equity_curve.append((timestamp, current_equity))
-            
-            # Update drawdown
-            if current_equity > self.peak_balance:
-                self.peak_balance = current_equity
-            else:
-                drawdown = self.peak_balance - current_equity
-                if drawdown > self.max_drawdown:
-                    self.max_drawdown = drawdown
+            self._equity[i] = self._calculate_total_equity()
         
         return self._generate_result(start_date, end_date)
     
+    def _walk_signals(self, strategy: BaseStrategy, batch_signals: Dict[str, List[int]],
+                      soa: Dict[str, Dict[str, np.ndarray]], tick_cursors: Dict[str, np.ndarray],
+                      cursors: Dict[str, int], timestamp_objects: List[datetime], tick_ns: np.ndarray):
+        symbol_ids = self._symbol_ids
+        last_price = self._last_price
+        closes = {symbol: arrays['close'] for symbol, arrays in soa.items()}
+        
+        for i, current_timestamp in enumerate(timestamp_objects):
+            self.current_timestamp = current_timestamp
+            self._current_ts_ns = tick_ns[i]
+            
+            # Each symbol acts once per new bar, after the same 20-bar warm-up as analyze()
+            for symbol, positions in tick_cursors.items():
+                cursor = int(positions[i])
+                if cursor > cursors[symbol]:
+                    cursors[symbol] = cursor
+                    price = float(closes[symbol][cursor - 1])
+                    last_price[symbol_ids[symbol]] = price
+                    
+                    if cursor >= 20:
+                        signal_code = batch_signals[symbol][cursor - 1]
+                        if signal_code:
+                            self._process_signal_fast(strategy, symbol, signal_code, price)
+            
+            self._equity[i] = self._calculate_total_equity()
+    
+    def _process_signal_fast(self, strategy: BaseStrategy, symbol: str, signal_code: int, price: float):
+        # Batch codes carry no position state, so resolve them against the book:
+        # an entry against an open position closes it, exits need a matching side
+        side = self._pos_side[self._symbol_ids[symbol]]
+        if signal_code == SignalType.BUY:
+            signal_type = SignalType.CLOSE_SHORT if side < 0 else SignalType.BUY
+        elif signal_code == SignalType.SELL:
+            signal_type = SignalType.CLOSE_LONG if side > 0 else SignalType.SELL
+        elif signal_code == SignalType.CLOSE_LONG and side > 0:
+            signal_type = SignalType.CLOSE_LONG
+        elif signal_code == SignalType.CLOSE_SHORT and side < 0:
+            signal_type = SignalType.CLOSE_SHORT
+        else:
+            return
+        
+        signal = TradingSignal(
+            symbol=symbol,
+            signal_type=signal_type,
+            price=price,
+            amount=strategy.batch_amount,
+            confidence=1.0,
+            timestamp=self.current_timestamp
+        )
+        if (1 << signal_type) & _OPEN_MASK:
+            self._open_position(signal)
+        else:
+            self._close_position(signal)
+    
+    @staticmethod
+    def _merge_timestamps(ts_arrays: List[np.ndarray]) -> np.ndarray:
+        first = ts_arrays[0]
+        
+        # Symbols on a shared timeframe usually have identical, already sorted timelines
+        if (np.all(first[1:] > first[:-1]) and
+            all(np.array_equal(first, ts) for ts in ts_arrays[1:])):
+            return first
+        
+        return np.unique(np.concatenate(ts_arrays))
+    
+    @staticmethod
+    def _to_soa(data: List[MarketData]) -> Dict[str, np.ndarray]:
+        return {
+            'ts': np.array([d.timestamp for d in data], dtype='datetime64[ns]'),
+            'open': np.array([d.open for d in data], dtype=np.float64),
+            'high': np.array([d.high for d in data], dtype=np.float64),
+            'low': np.array([d.low for d in data], dtype=np.float64),
+            'close': np.array([d.close for d in data], dtype=np.float64),
+            'volume': np.array([d.volume for d in data], dtype=np.float64)
+        }
+    
     def _process_signal(self, signal: TradingSignal, current_market_data: MarketData):
-        if signal.signal_type in [SignalType.BUY, SignalType.SELL]:
+        signal_bit = 1 << signal.signal_type
+        if signal_bit & _OPEN_MASK:
             self._open_position(signal, current_market_data)
-        elif signal.signal_type in [SignalType.CLOSE_LONG, SignalType.CLOSE_SHORT]:
+        elif signal_bit & _CLOSE_MASK:
             self._close_position(signal, current_market_data)
     
-    def _open_position(self, signal: TradingSignal, market_data: MarketData):
+    def _open_position(self, signal: TradingSignal, market_data: Optional[MarketData] = None):
+        is_buy = signal.signal_type is SignalType.BUY
+        symbol = signal.symbol
+        price = signal.price
+        amount = signal.amount
+        balance = self.balance
+        
         # Check if we have enough balance
-        position_value = signal.amount * signal.price
-        commission_cost = position_value * self.commission
-        total_cost = position_value + commission_cost
+        total_cost = amount * price * self._one_plus_commission
         
-        if signal.signal_type == SignalType.BUY and total_cost > self.balance:
-            logger.warning(f"Insufficient balance for BUY order: {total_cost} > {self.balance}")
+        if is_buy and total_cost > balance:
+            logger.warning(f"Insufficient balance for BUY order: {total_cost} > {balance}")
             return
         
         # Calculate actual position size based on available balance
-        if signal.signal_type == SignalType.BUY:
-            max_position_value = self.balance * 0.95  # Use 95% of balance
-            actual_amount = min(signal.amount, max_position_value / signal.price)
+        if is_buy:
+            actual_amount = min(amount, balance * 0.95 / price)  # Use 95% of balance
+            self.balance = balance - actual_amount * price * self._one_plus_commission
         else:
-            actual_amount = signal.amount
+            actual_amount = amount
         
         # Create position
-        side = "long" if signal.signal_type == SignalType.BUY else "short"
-        position = Position(
-            symbol=signal.symbol,
+        side = "long" if is_buy else "short"
+        sid = self._symbol_ids[symbol]
+        self._pos_side[sid] = 1 if is_buy else -1
+        self._pos_size[sid] = actual_amount
+        self._pos_entry[sid] = price
+        self._pos_entry_ts[sid] = self._current_ts_ns
+        self.positions[symbol] = Position(
+            symbol=symbol,
             side=side,
             size=actual_amount,
-            entry_price=signal.price,
+            entry_price=price,
             unrealized_pnl=0.0,
             percentage=0.0,
             leverage=signal.leverage
         )
         
-        # Update balance
-        if signal.signal_type == SignalType.BUY:
-            self.balance -= (actual_amount * signal.price + actual_amount * signal.price * self.commission)
-        
-        self.positions[signal.symbol] = position
-        
-        logger.debug(f"Opened {side} position: {signal.symbol} {actual_amount} @ {signal.price}")
+        # Arguments are only formatted if a sink takes debug records
+        logger.debug("Opened {} position: {} {} @ {}", side, symbol, actual_amount, price)
     
-    def _close_position(self, signal: TradingSignal, market_data: MarketData):
-        if signal.symbol not in self.positions:
+    def _close_position(self, signal: TradingSignal, market_data: Optional[MarketData] = None):
+        symbol = signal.symbol
+        position = self.positions.get(symbol)
+        if position is None:
             return
         
-        position = self.positions[signal.symbol]
         exit_price = signal.price
-        
-        # Calculate P&L
-        if position.side == "long":
-            pnl = (exit_price - position.entry_price) * position.size
-        else:
-            pnl = (position.entry_price - exit_price) * position.size
-        
-        # Account for commission
-        commission_cost = position.size * exit_price * self.commission
-        net_pnl = pnl - commission_cost
-        
-        # Update balance
-        if position.side == "long":
-            self.balance += position.size * exit_price - commission_cost
+        size = position.size
+        entry_price = position.entry_price
+        side = position.side
+        exit_value = size * exit_price
+        
+        # P&L net of exit commission
+        commission_cost = exit_value * self.commission
+        if side == "long":
+            net_pnl = (exit_price - entry_price) * size - commission_cost
+            self.balance += exit_value * self._one_minus_commission
         else:
+            net_pnl = (entry_price - exit_price) * size - commission_cost
             self.balance += net_pnl
         
         # Record trade
-        trade = {
-            'symbol': signal.symbol,
-            'side': position.side,
-            'entry_price': position.entry_price,
-            'exit_price': exit_price,
-            'size': position.size,
-            'entry_time': self.current_timestamp,
-            'exit_time': self.current_timestamp,
-            'pnl': net_pnl,
-            'return_pct': (net_pnl / (position.size * position.entry_price)) * 100
-        }
-        self.closed_trades.append(trade)
+        sid = self._symbol_ids[symbol]
+        if self._n_trades == len(self._trades):
+            self._trades = np.resize(self._trades, 2 * len(self._trades))
+        self._trades[self._n_trades] = (
+            sid,
+            self._pos_side[sid],
+            entry_price,
+            exit_price,
+            size,
+            self._pos_entry_ts[sid],
+            self._current_ts_ns,
+            net_pnl,
+            (net_pnl / (size * entry_price)) * 100
+        )
+        self._n_trades += 1
         
-        # Remove position
-        del self.positions[signal.symbol]
+        # Remove position, also from the strategy so analyze() does not keep
+        # turning entries into exits for it
+        del self.positions[symbol]
+        if self._strategy is not None:
+            self._strategy.remove_position(symbol)
+        self._pos_side[sid] = 0
+        self._pos_size[sid] = 0.0
         
-        logger.debug(f"Closed {position.side} position: {signal.symbol} P&L: {net_pnl:.2f}")
+        logger.debug("Closed {} position: {} P&L: {:.2f}", side, symbol, net_pnl)
     
-    def _calculate_total_equity(self, market_data: Dict[str, List[MarketData]]) -> float:
-        total_equity = self.balance
-        
-        for symbol, position in self.positions.items():
-            if symbol in market_data and market_data[symbol]:
-                current_price = market_data[symbol][-1].close
-                
-                if position.side == "long":
-                    position_value = position.size * current_price
-                    unrealized_pnl = (current_price - position.entry_price) * position.size
-                else:
-                    position_value = position.size * position.entry_price
-                    unrealized_pnl = (position.entry_price - current_price) * position.size
-                
-                total_equity += unrealized_pnl
-        
-        return total_equity
+    def _calculate_total_equity(self) -> float:
+        return _equity(self.balance, self._pos_side, self._pos_size, self._pos_entry, self._last_price)
     
     def _generate_result(self, start_date: datetime, end_date: datetime) -> BacktestResult:
-        final_balance = self.equity_curve[-1][1] if self.equity_curve else self.balance
+        final_balance = float(self._equity[-1]) if self._equity.size else self.balance
         
         # Calculate returns
         total_return = final_balance - self.initial_balance
         total_return_pct = (total_return / self.initial_balance) * 100
         
-        # Calculate drawdown percentage
-        max_drawdown_pct = (self.max_drawdown / self.peak_balance) * 100 if self.peak_balance > 0 else 0
+        # Drawdown and log-return risk metrics in one pass over the equity curve
+        (max_drawdown, max_drawdown_pct, sharpe_ratio, sortino_ratio, calmar_ratio,
+         annualized_return_pct, annualized_volatility_pct) = _stats(self._equity)
         
         # Calculate trade statistics
-        winning_trades = len([t for t in self.closed_trades if t['pnl'] > 0])
-        losing_trades = len([t for t in self.closed_trades if t['pnl'] < 0])
-        total_trades = len(self.closed_trades)
+        trade_log = self._trades[:self._n_trades]
+        pnl = trade_log['pnl']
+        wins = pnl[pnl > 0]
+        losses = -pnl[pnl < 0]
+        
+        winning_trades = int(wins.size)
+        losing_trades = int(losses.size)
+        total_trades = self._n_trades
         
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
         # Calculate average win/loss
-        wins = [t['pnl'] for t in self.closed_trades if t['pnl'] > 0]
-        losses = [t['pnl'] for t in self.closed_trades if t['pnl'] < 0]
-        
-        avg_win = np.mean(wins) if wins else 0
-        avg_loss = np.mean([abs(l) for l in losses]) if losses else 0
+        avg_win = float(wins.mean()) if winning_trades else 0
+        avg_loss = float(losses.mean()) if losing_trades else 0
         
         # Profit factor
-        total_wins = sum(wins) if wins else 0
-        total_losses = sum([abs(l) for l in losses]) if losses else 0
+        total_wins = float(wins.sum())
+        total_losses = float(losses.sum())
         profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
         
-        # Sharpe ratio (simplified)
-        if len(self.equity_curve) > 1:
-            returns = []
-            for i in range(1, len(self.equity_curve)):
-                ret = (self.equity_curve[i][1] - self.equity_curve[i-1][1]) / self.equity_curve[i-1][1]
-                returns.append(ret)
-            
-            if returns and np.std(returns) > 0:
-                sharpe_ratio = np.mean(returns) / np.std(returns) * np.sqrt(252)  # Annualized
-            else:
-                sharpe_ratio = 0
-        else:
-            sharpe_ratio = 0
-        
         duration_days = (end_date - start_date).days
         
         return BacktestResult(
@@ -263,9 +445,13 @@ class BacktestEngine:
             final_balance=final_balance,
             total_return=total_return,
             total_return_pct=total_return_pct,
-            max_drawdown=self.max_drawdown,
+            max_drawdown=max_drawdown,
             max_drawdown_pct=max_drawdown_pct,
             sharpe_ratio=sharpe_ratio,
+            sortino_ratio=sortino_ratio,
+            calmar_ratio=calmar_ratio,
+            annualized_return_pct=annualized_return_pct,
+            annualized_volatility_pct=annualized_volatility_pct,
             total_trades=total_trades,
             winning_trades=winning_trades,
             losing_trades=losing_trades,
@@ -276,6 +462,8 @@ class BacktestEngine:
             start_date=start_date,
             end_date=end_date,
             duration_days=duration_days,
-            trades=self.closed_trades,
-            equity_curve=self.equity_curve
+            trade_log=trade_log.copy(),
+            symbols=list(self._symbol_names),
+            equity=self._equity,
+            equity_timestamps=self._equity_ts
         )
\ No newline at end of file
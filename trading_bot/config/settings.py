@@ -1,15 +1,17 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
 class ExchangeConfig(BaseModel):
     api_key: str
     api_secret: str
     testnet: bool = True
     rate_limit: int = 10
+    markets_refresh_interval: int = 3600
+    # Additional (api_key, api_secret) pairs rotated for market-data requests
+    extra_credentials: List[Tuple[str, str]] = []
 
 class TelegramConfig(BaseModel):
     bot_token: str
@@ -22,9 +24,12 @@ class TradingConfig(BaseModel):
     stop_loss_percentage: float = 0.02
     take_profit_percentage: float = 0.04
     leverage: int = 1
+    max_concurrency: int = 10
 
 class DatabaseConfig(BaseModel):
     url: str = "sqlite:///trading_bot.db"
+    # Persist closed candles so restarts only fetch bars they have not seen
+    cache_candles: bool = True
 
 class Settings(BaseModel):
     exchanges: Dict[str, ExchangeConfig] = {}
@@ -36,39 +41,62 @@ class Settings(BaseModel):
     @classmethod
     def from_env(cls) -> "Settings":
         settings = cls()
+        env = os.environ
         
         # Binance
-        if os.getenv("BINANCE_API_KEY"):
+        if env.get("BINANCE_API_KEY"):
             settings.exchanges["binance"] = ExchangeConfig(
-                api_key=os.getenv("BINANCE_API_KEY"),
-                api_secret=os.getenv("BINANCE_API_SECRET"),
-                testnet=os.getenv("BINANCE_TESTNET", "true").lower() == "true"
+                api_key=env.get("BINANCE_API_KEY"),
+                api_secret=env.get("BINANCE_API_SECRET"),
+                testnet=env.get("BINANCE_TESTNET", "true").lower() == "true",
+                extra_credentials=[
+                    tuple(pair.split(":", 1))
+                    for pair in env.get("BINANCE_EXTRA_API_KEYS", "").split(",") if pair
+                ]
             )
         
         # OKX
-        if os.getenv("OKX_API_KEY"):
+        if env.get("OKX_API_KEY"):
             settings.exchanges["okx"] = ExchangeConfig(
-                api_key=os.getenv("OKX_API_KEY"),
-                api_secret=os.getenv("OKX_API_SECRET"),
-                testnet=os.getenv("OKX_TESTNET", "true").lower() == "true"
+                api_key=env.get("OKX_API_KEY"),
+                api_secret=env.get("OKX_API_SECRET"),
+                testnet=env.get("OKX_TESTNET", "true").lower() == "true"
             )
         
         # Bybit
-        if os.getenv("BYBIT_API_KEY"):
+        if env.get("BYBIT_API_KEY"):
             settings.exchanges["bybit"] = ExchangeConfig(
-                api_key=os.getenv("BYBIT_API_KEY"),
-                api_secret=os.getenv("BYBIT_API_SECRET"),
-                testnet=os.getenv("BYBIT_TESTNET", "true").lower() == "true"
+                api_key=env.get("BYBIT_API_KEY"),
+                api_secret=env.get("BYBIT_API_SECRET"),
+                testnet=env.get("BYBIT_TESTNET", "true").lower() == "true"
             )
         
+        if env.get("MARKETS_REFRESH_INTERVAL"):
+            for config in settings.exchanges.values():
+                config.markets_refresh_interval = int(env.get("MARKETS_REFRESH_INTERVAL"))
+        
+        # Trading
+        if env.get("MAX_CONCURRENCY"):
+            settings.trading.max_concurrency = int(env.get("MAX_CONCURRENCY"))
+        
         # Telegram
-        if os.getenv("TELEGRAM_BOT_TOKEN"):
+        if env.get("TELEGRAM_BOT_TOKEN"):
             settings.telegram = TelegramConfig(
-                bot_token=os.getenv("TELEGRAM_BOT_TOKEN"),
-                chat_id=os.getenv("TELEGRAM_CHAT_ID"),
-                allowed_users=os.getenv("TELEGRAM_ALLOWED_USERS", "").split(",")
+                bot_token=env.get("TELEGRAM_BOT_TOKEN"),
+                chat_id=env.get("TELEGRAM_CHAT_ID"),
+                allowed_users=env.get("TELEGRAM_ALLOWED_USERS", "").split(",")
             )
         
         return settings
 
-settings = Settings.from_env()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    load_dotenv()
+    return Settings.from_env()
+
+def __getattr__(name: str):
+    # Keep `from trading_bot.config.settings import settings` working without
+    # reading the environment at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,14 +1,39 @@
 import asyncio
-from typing import Dict, List, Optional
+import math
+import time
+import aiohttp
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
-from ..config.settings import settings
+from ..config.settings import get_settings
 from ..exchanges import create_exchange, BaseExchange, OrderSide, OrderType
-from ..strategies.base import BaseStrategy, TradingSignal, SignalType
+from ..strategies.base import BaseStrategy, TradingSignal, SignalType, MarketData
+from ..strategies.indicator_cache import IndicatorCache
 from ..telegram_bot import TradingTelegramBot
+from ..utils.candle_cache import CandleCache
 from ..utils.data_fetcher import DataFetcher
 
+# Quote currencies that fund new positions, in order of preference
+QUOTE_CURRENCIES = ('USDT', 'USD', 'BUSD')
+
+# Trade notification templates, filled with str.format_map
+TRADE_MESSAGE_TEMPLATE = (
+    "{emoji} **Trade Executed**\\n\\n"
+    "Exchange: {exchange}\\n"
+    "Symbol: `{symbol}`\\n"
+    "Side: {side}\\n"
+    "Amount: {amount}\\n"
+    "Price: ${price:.4f}\\n"
+    "Confidence: {confidence:.1%}\\n"
+    "Order ID: `{order_id}`\\n"
+)
+STOP_LOSS_LINE = "Stop Loss: ${:.4f}\\n"
+TAKE_PROFIT_LINE = "Take Profit: ${:.4f}\\n"
+
+# Seconds to wait past a bar close so the exchange has published the candle
+BAR_CLOSE_GRACE = 1.0
+
 class TradingEngine:
     def __init__(self):
         self.exchanges: Dict[str, BaseExchange] = {}
@@ -17,27 +42,60 @@ class TradingEngine:
         self.telegram_bot: Optional[TradingTelegramBot] = None
         self.is_running = False
         self.active_symbols = set()
+        # Caps in-flight exchange requests across every concurrent task
+        self._request_semaphore = asyncio.Semaphore(get_settings().trading.max_concurrency)
+        self._http_session = self._create_http_session()
+        self._watch_tasks: List[asyncio.Task] = []
+        # Set by stop() to wake the polling loop out of its wait for the next bar
+        self._stop_event = asyncio.Event()
+        # Timestamp of the newest closed candle applied per (strategy, symbol, timeframe)
+        self._last_candle: Dict[Tuple[str, str, str], datetime] = {}
+        # (strategy, symbol) pairs that received candles since their last analysis
+        self._dirty: Set[Tuple[str, str]] = set()
+        # Indicator caches shared per set of required timeframes
+        self._indicator_caches: Dict[Tuple[str, ...], IndicatorCache] = {}
         
         self._initialize_exchanges()
         self._initialize_telegram()
     
+    @staticmethod
+    def _create_http_session() -> Optional[aiohttp.ClientSession]:
+        # One keep-alive connection pool shared by every async exchange client;
+        # without a running loop each client falls back to its own session
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=75)
+        return aiohttp.ClientSession(connector=connector)
+    
     def _initialize_exchanges(self):
-        for exchange_name, config in settings.exchanges.items():
+        database = get_settings().database
+        self._candle_cache = CandleCache.from_url(database.url) if database.cache_candles else None
+        
+        for exchange_name, config in get_settings().exchanges.items():
             try:
                 exchange = create_exchange(
                     exchange_name, 
                     config.api_key, 
                     config.api_secret, 
-                    config.testnet
+                    config.testnet,
+                    session=self._http_session,
+                    extra_credentials=config.extra_credentials
                 )
                 self.exchanges[exchange_name] = exchange
-                self.data_fetchers[exchange_name] = DataFetcher(exchange)
+                self.data_fetchers[exchange_name] = DataFetcher(exchange, self._candle_cache)
                 logger.info(f"Initialized {exchange_name} exchange")
             except Exception as e:
                 logger.error(f"Failed to initialize {exchange_name}: {e}")
+        
+        # The first exchange serves market data and order routing
+        self._primary_exchange_name = next(iter(self.exchanges), None)
+        self._primary_exchange = self.exchanges.get(self._primary_exchange_name)
+        self._primary_data_fetcher = self.data_fetchers.get(self._primary_exchange_name)
     
     def _initialize_telegram(self):
-        if settings.telegram:
+        if get_settings().telegram:
             try:
                 self.telegram_bot = TradingTelegramBot()
                 logger.info("Initialized Telegram bot")
@@ -45,6 +103,10 @@ class TradingEngine:
                 logger.error(f"Failed to initialize Telegram bot: {e}")
     
     def add_strategy(self, strategy: BaseStrategy, symbols: List[str]):
+        # Strategies on the same timeframes receive the same candles, so they can
+        # advance one copy of any indicator they have in common
+        timeframes = tuple(sorted(strategy.get_required_timeframes()))
+        strategy.indicator_cache = self._indicator_caches.setdefault(timeframes, IndicatorCache())
         self.strategies[strategy.name] = strategy
         self.active_symbols.update(symbols)
         logger.info(f"Added strategy: {strategy.name} for symbols: {symbols}")
@@ -60,24 +122,63 @@ class TradingEngine:
             return
         
         self.is_running = True
+        self._stop_event.clear()
         logger.info("Starting trading engine...")
         
-        # Start telegram bot in background if configured
+        # Start telegram bot polling on this loop if configured
         if self.telegram_bot:
-            asyncio.create_task(self._run_telegram_bot())
+            await self._start_telegram_bot()
+        
+        await self._start_exchanges()
         
-        # Start main trading loop
-        await self._trading_loop()
+        # Follow closed candles over WebSocket when the data exchange can
+        # stream them, otherwise poll over REST
+        exchange = self._primary_exchange
+        if exchange is not None and exchange.supports_streaming:
+            await self._stream_market_data(exchange)
+        else:
+            await self._trading_loop()
+    
+    async def _start_exchanges(self):
+        configs = get_settings().exchanges
+        names = list(self.exchanges)
+        results = await asyncio.gather(
+            *[
+                self.exchanges[name].start(configs[name].markets_refresh_interval)
+                if name in configs else self.exchanges[name].start()
+                for name in names
+            ],
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error starting {name} exchange: {result}")
     
     async def stop(self):
         logger.info("Stopping trading engine...")
         self.is_running = False
+        self._stop_event.set()
+        
+        for task in self._watch_tasks:
+            task.cancel()
+        self._watch_tasks = []
+        
+        for exchange in self.exchanges.values():
+            await exchange.close()
+        if self._http_session is not None:
+            await self._http_session.close()
+        if self._candle_cache is not None:
+            self._candle_cache.close()
+        if self.telegram_bot:
+            try:
+                await self.telegram_bot.stop()
+            except Exception as e:
+                logger.error(f"Error stopping Telegram bot: {e}")
     
-    async def _run_telegram_bot(self):
+    async def _start_telegram_bot(self):
+        # Runs on the engine loop instead of holding a default executor thread
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.telegram_bot.run
-            )
+            await self.telegram_bot.start_polling()
         except Exception as e:
             logger.error(f"Telegram bot error: {e}")
     
@@ -85,88 +186,192 @@ class TradingEngine:
         while self.is_running:
             try:
                 await self._process_strategies()
-                await asyncio.sleep(60)  # Wait 1 minute between cycles
+                # Wake just after the next candle closes on the shortest timeframe
+                delay = self._next_bar_close() + BAR_CLOSE_GRACE - time.time()
+                await self._sleep(max(delay, 0.0))
             except Exception as e:
                 logger.error(f"Error in trading loop: {e}")
-                await asyncio.sleep(30)  # Wait 30 seconds on error
+                await self._sleep(30)  # Wait 30 seconds on error
+    
+    def _next_bar_close(self) -> float:
+        # Candles close on multiples of their span since the epoch
+        spans = {
+            DataFetcher.timeframe_span(timeframe).total_seconds()
+            for strategy in self.strategies.values()
+            for timeframe in strategy.get_required_timeframes()
+        }
+        now = time.time()
+        if not spans:
+            return now + 60
+        return min(math.floor(now / span + 1) * span for span in spans)
+    
+    async def _sleep(self, delay: float):
+        # Returns early when stop() is called
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
     
     async def _process_strategies(self):
-        for strategy_name, strategy in self.strategies.items():
-            try:
-                await self._process_strategy(strategy)
-            except Exception as e:
-                logger.error(f"Error processing strategy {strategy_name}: {e}")
+        # Strategies are independent, so run their cycles concurrently and
+        # log failures per strategy as before
+        strategies = list(self.strategies.items())
+        results = await asyncio.gather(
+            *[self._process_strategy(strategy) for _, strategy in strategies],
+            return_exceptions=True
+        )
+        for (strategy_name, _), result in zip(strategies, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing strategy {strategy_name}: {result}")
     
     async def _process_strategy(self, strategy: BaseStrategy):
         # Get required timeframes
         timeframes = strategy.get_required_timeframes()
+        symbols = list(self.active_symbols)
         
-        for symbol in self.active_symbols:
+        # Fetch market data for every symbol and timeframe concurrently
+        fetches = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        results = await asyncio.gather(
+            *[
+                self._fetch_market_data(
+                    symbol, timeframe, self._last_candle.get((strategy.name, symbol, timeframe))
+                )
+                for symbol, timeframe in fetches
+            ],
+            return_exceptions=True
+        )
+        
+        # Apply the fetched candles in a fixed order regardless of completion order
+        for (symbol, timeframe), result in zip(fetches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching market data for {symbol}: {result}")
+            else:
+                self._apply_market_data(strategy, symbol, timeframe, result)
+        
+        # Signals only change when a new candle arrived for the symbol
+        for symbol in symbols:
+            if (strategy.name, symbol) in self._dirty:
+                await self._analyze_symbol(strategy, symbol)
+    
+    async def _analyze_symbol(self, strategy: BaseStrategy, symbol: str):
+        self._dirty.discard((strategy.name, symbol))
+        try:
+            # Get trading signal
+            market_data = strategy.get_market_data(symbol, 100)
+            if len(market_data) < 20:
+                return
+            
+            signal = strategy.analyze(symbol, market_data)
+            
+            if signal.signal_type is not SignalType.HOLD and signal.confidence > 0.6:
+                await self._execute_signal(signal, strategy)
+        
+        except Exception as e:
+            logger.error(f"Error processing {symbol} for strategy {strategy.name}: {e}")
+    
+    async def _stream_market_data(self, exchange: BaseExchange):
+        # Backfill history over REST once, then react to each closed candle
+        await self._process_strategies()
+        
+        timeframes = {
+            timeframe
+            for strategy in self.strategies.values()
+            for timeframe in strategy.get_required_timeframes()
+        }
+        self._watch_tasks = [
+            asyncio.create_task(self._watch_symbol(exchange, symbol, timeframe))
+            for symbol in self.active_symbols
+            for timeframe in timeframes
+        ]
+        await asyncio.gather(*self._watch_tasks, return_exceptions=True)
+    
+    async def _watch_symbol(self, exchange: BaseExchange, symbol: str, timeframe: str):
+        forming = None
+        while self.is_running:
             try:
-                # Fetch market data for all required timeframes
-                for timeframe in timeframes:
-                    await self._update_market_data(strategy, symbol, timeframe)
-                
-                # Get trading signal
-                market_data = strategy.get_market_data(symbol, 100)
-                if len(market_data) < 20:
-                    continue
-                
-                signal = strategy.analyze(symbol, market_data)
-                
-                if signal.signal_type != SignalType.HOLD and signal.confidence > 0.6:
-                    await self._execute_signal(signal, strategy)
-                    
+                candles = await exchange.watch_ohlcv(symbol, timeframe)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.error(f"Error processing {symbol} for strategy {strategy.name}: {e}")
+                logger.error(f"Error watching {symbol} {timeframe}: {e}")
+                await asyncio.sleep(5)  # Back off before reconnecting
+                continue
+            
+            # A candle is final once the stream moves on to a newer one
+            for candle in candles:
+                if forming is not None and candle[0] > forming[0]:
+                    await self._on_closed_candle(symbol, timeframe, forming)
+                if forming is None or candle[0] >= forming[0]:
+                    forming = candle
     
-    async def _update_market_data(self, strategy: BaseStrategy, symbol: str, timeframe: str):
-        # Use the first available exchange for data fetching
-        exchange_name = list(self.exchanges.keys())[0]
-        data_fetcher = self.data_fetchers[exchange_name]
+    async def _on_closed_candle(self, symbol: str, timeframe: str, candle: List[float]):
+        bars = DataFetcher.to_market_data(symbol, [candle])
+        for strategy in self.strategies.values():
+            # A candle older than the strategy's newest bar (e.g. a 4h close
+            # behind the 1h bars) is dropped and must not re-run analysis
+            if timeframe in strategy.get_required_timeframes():
+                if self._apply_market_data(strategy, symbol, timeframe, bars):
+                    await self._analyze_symbol(strategy, symbol)
+    
+    async def _fetch_market_data(self, symbol: str, timeframe: str,
+                                 last_candle: Optional[datetime] = None) -> List[MarketData]:
+        data_fetcher = self._primary_data_fetcher
         
-        try:
-            # Fetch last 100 candles
-            end_time = datetime.now()
+        # Only request candles after the last one applied; the first fetch
+        # backfills the last 100 hours
+        end_time = datetime.now()
+        if last_candle is not None:
+            start_time = last_candle + timedelta(milliseconds=1)
+        else:
             start_time = end_time - timedelta(hours=100)
-            
+        
+        async with self._request_semaphore:
             market_data = await data_fetcher.fetch_historical_data(
                 symbol=symbol,
                 timeframe=timeframe,
                 start_date=start_time,
                 end_date=end_time
             )
-            
-            strategy.add_market_data(symbol, market_data)
-            
-        except Exception as e:
-            logger.error(f"Error fetching market data for {symbol}: {e}")
+        
+        # Drop the still-forming candle so the next fetch picks it up once final
+        span = DataFetcher.timeframe_span(timeframe)
+        return [bar for bar in market_data if bar.timestamp + span <= end_time]
+    
+    def _apply_market_data(self, strategy: BaseStrategy, symbol: str, timeframe: str,
+                           market_data: List[MarketData]) -> int:
+        # Only appended bars move the fetch cursor and call for a new analysis
+        appended = strategy.add_market_data(symbol, market_data)
+        if appended:
+            self._last_candle[(strategy.name, symbol, timeframe)] = strategy.market_data[symbol][-1].timestamp
+            self._dirty.add((strategy.name, symbol))
+        return appended
     
     async def _execute_signal(self, signal: TradingSignal, strategy: BaseStrategy):
-        logger.info(f"Executing signal: {signal.signal_type.value} {signal.symbol} @ {signal.price}")
+        logger.info(f"Executing signal: {signal.signal_type.name.lower()} {signal.symbol} @ {signal.price}")
         
         # Choose exchange (use first available for now)
-        exchange_name = list(self.exchanges.keys())[0]
-        exchange = self.exchanges[exchange_name]
+        exchange_name = self._primary_exchange_name
+        exchange = self._primary_exchange
         
         try:
             # Determine order side and type
-            if signal.signal_type == SignalType.BUY:
+            if signal.signal_type is SignalType.BUY:
                 side = OrderSide.BUY
                 order_type = OrderType.MARKET
-                
-            elif signal.signal_type == SignalType.SELL:
+            
+            elif signal.signal_type is SignalType.SELL:
                 side = OrderSide.SELL
                 order_type = OrderType.MARKET
-                
+            
             else:  # Close positions
                 await self._close_position(signal, exchange)
                 return
             
             # Calculate position size based on risk management
-            balances = await exchange.get_balance()
+            async with self._request_semaphore:
+                balances = await exchange.get_balance_map()
             base_currency_balance = next(
-                (b for b in balances if b.symbol in ['USDT', 'USD', 'BUSD']), 
+                (balances[quote] for quote in QUOTE_CURRENCIES if quote in balances),
                 None
             )
             
@@ -177,31 +382,28 @@ class TradingEngine:
             # Calculate position size
             account_balance = base_currency_balance.free
             position_size = strategy.calculate_position_size(
-                signal, account_balance, settings.trading.risk_per_trade
-            )
-            
-            # Place main order
-            order = await exchange.create_order(
-                symbol=signal.symbol,
-                side=side,
-                order_type=order_type,
-                amount=position_size,
-                price=signal.price if order_type == OrderType.LIMIT else None
+                signal, account_balance, get_settings().trading.risk_per_trade
             )
             
-            logger.info(f"Order placed: {order.id}")
-            
-            # Place stop loss and take profit if specified
-            if signal.stop_loss:
-                await self._place_stop_loss(signal, exchange, position_size)
+            # Place the main order, then its stop loss and take profit together
+            async with self._request_semaphore:
+                orders = await exchange.create_bracket_orders(
+                    symbol=signal.symbol,
+                    side=side,
+                    order_type=order_type,
+                    amount=position_size,
+                    price=signal.price if order_type is OrderType.LIMIT else None,
+                    stop_loss=signal.stop_loss or None,
+                    take_profit=signal.take_profit or None
+                )
+            order = orders[0]
             
-            if signal.take_profit:
-                await self._place_take_profit(signal, exchange, position_size)
+            logger.info(f"Order placed: {order.id} with {len(orders) - 1} protective orders")
             
             # Send telegram notification
             if self.telegram_bot:
                 await self._send_trade_notification(signal, order, exchange_name)
-                
+        
         except Exception as e:
             logger.error(f"Error executing signal: {e}")
             if self.telegram_bot:
@@ -213,7 +415,8 @@ class TradingEngine:
     
     async def _close_position(self, signal: TradingSignal, exchange: BaseExchange):
         try:
-            positions = await exchange.get_positions()
+            async with self._request_semaphore:
+                positions = await exchange.get_positions()
             position = next(
                 (p for p in positions if p.symbol == signal.symbol), 
                 None
@@ -227,103 +430,89 @@ class TradingEngine:
             close_side = OrderSide.SELL if position.side == "long" else OrderSide.BUY
             
             # Place close order
-            order = await exchange.create_order(
-                symbol=signal.symbol,
-                side=close_side,
-                order_type=OrderType.MARKET,
-                amount=position.size
-            )
+            async with self._request_semaphore:
+                order = await exchange.create_order(
+                    symbol=signal.symbol,
+                    side=close_side,
+                    order_type=OrderType.MARKET,
+                    amount=position.size
+                )
             
             logger.info(f"Position closed: {order.id}")
-            
+        
         except Exception as e:
             logger.error(f"Error closing position: {e}")
     
-    async def _place_stop_loss(self, signal: TradingSignal, exchange: BaseExchange, amount: float):
-        try:
-            stop_side = OrderSide.SELL if signal.signal_type == SignalType.BUY else OrderSide.BUY
-            
-            await exchange.create_stop_loss_order(
-                symbol=signal.symbol,
-                side=stop_side,
-                amount=amount,
-                stop_price=signal.stop_loss
-            )
-            
-            logger.info(f"Stop loss placed at {signal.stop_loss}")
-            
-        except Exception as e:
-            logger.error(f"Error placing stop loss: {e}")
-    
-    async def _place_take_profit(self, signal: TradingSignal, exchange: BaseExchange, amount: float):
-        try:
-            tp_side = OrderSide.SELL if signal.signal_type == SignalType.BUY else OrderSide.BUY
-            
-            await exchange.create_take_profit_order(
-                symbol=signal.symbol,
-                side=tp_side,
-                amount=amount,
-                price=signal.take_profit
-            )
-            
-            logger.info(f"Take profit placed at {signal.take_profit}")
-            
-        except Exception as e:
-            logger.error(f"Error placing take profit: {e}")
-    
     async def _send_trade_notification(self, signal: TradingSignal, order, exchange_name: str):
         try:
-            side_emoji = "🟢" if signal.signal_type == SignalType.BUY else "🔴"
-            message = f"{side_emoji} **Trade Executed**\\n\\n"
-            message += f"Exchange: {exchange_name.upper()}\\n"
-            message += f"Symbol: `{signal.symbol}`\\n"
-            message += f"Side: {signal.signal_type.value.upper()}\\n"
-            message += f"Amount: {signal.amount}\\n"
-            message += f"Price: ${signal.price:.4f}\\n"
-            message += f"Confidence: {signal.confidence:.1%}\\n"
-            message += f"Order ID: `{order.id}`\\n"
+            message = TRADE_MESSAGE_TEMPLATE.format_map({
+                'emoji': "🟢" if signal.signal_type is SignalType.BUY else "🔴",
+                'exchange': exchange_name.upper(),
+                'symbol': signal.symbol,
+                'side': signal.signal_type.name,
+                'amount': signal.amount,
+                'price': signal.price,
+                'confidence': signal.confidence,
+                'order_id': order.id
+            })
             
+            # Optional lines are joined once instead of growing the string
+            lines = [message]
             if signal.stop_loss:
-                message += f"Stop Loss: ${signal.stop_loss:.4f}\\n"
+                lines.append(STOP_LOSS_LINE.format(signal.stop_loss))
             if signal.take_profit:
-                message += f"Take Profit: ${signal.take_profit:.4f}\\n"
-            
-            await self.telegram_bot.send_notification(message)
+                lines.append(TAKE_PROFIT_LINE.format(signal.take_profit))
             
+            await self.telegram_bot.send_notification("".join(lines))
+        
         except Exception as e:
             logger.error(f"Error sending trade notification: {e}")
     
+    async def _limited(self, coro):
+        async with self._request_semaphore:
+            return await coro
+    
     async def get_portfolio_status(self) -> Dict:
         portfolio = {}
         
-        for exchange_name, exchange in self.exchanges.items():
-            try:
-                balances = await exchange.get_balance()
-                positions = await exchange.get_positions()
-                
-                portfolio[exchange_name] = {
-                    'balances': [
-                        {
-                            'symbol': b.symbol,
-                            'free': b.free,
-                            'used': b.used,
-                            'total': b.total
-                        } for b in balances if b.total > 0
-                    ],
-                    'positions': [
-                        {
-                            'symbol': p.symbol,
-                            'side': p.side,
-                            'size': p.size,
-                            'entry_price': p.entry_price,
-                            'unrealized_pnl': p.unrealized_pnl,
-                            'percentage': p.percentage
-                        } for p in positions
-                    ]
-                }
-                
-            except Exception as e:
-                logger.error(f"Error getting portfolio status for {exchange_name}: {e}")
-                portfolio[exchange_name] = {'error': str(e)}
+        # Query balances and positions of every exchange in one concurrent batch
+        exchanges = list(self.exchanges.items())
+        results = await asyncio.gather(
+            *[
+                self._limited(query())
+                for _, exchange in exchanges
+                for query in (exchange.get_balance, exchange.get_positions)
+            ],
+            return_exceptions=True
+        )
+        
+        for i, (exchange_name, _) in enumerate(exchanges):
+            balances, positions = results[2 * i], results[2 * i + 1]
+            error = next((r for r in (balances, positions) if isinstance(r, Exception)), None)
+            if error is not None:
+                logger.error(f"Error getting portfolio status for {exchange_name}: {error}")
+                portfolio[exchange_name] = {'error': str(error)}
+                continue
+            
+            portfolio[exchange_name] = {
+                'balances': [
+                    {
+                        'symbol': b.symbol,
+                        'free': b.free,
+                        'used': b.used,
+                        'total': b.total
+                    } for b in balances if b.total > 0
+                ],
+                'positions': [
+                    {
+                        'symbol': p.symbol,
+                        'side': p.side,
+                        'size': p.size,
+                        'entry_price': p.entry_price,
+                        'unrealized_pnl': p.unrealized_pnl,
+                        'percentage': p.percentage
+                    } for p in positions
+                ]
+            }
         
         return portfolio
\ No newline at end of file
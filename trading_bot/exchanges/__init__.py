@@ -1,3 +1,7 @@
+from typing import List, Optional, Tuple
+
+import aiohttp
+
 from .base import BaseExchange, OrderType, OrderSide, OrderStatus, Balance, Order, Position, Ticker
 from .binance import BinanceExchange
 from .okx import OKXExchange
@@ -9,7 +13,9 @@ __all__ = [
     'BinanceExchange', 'OKXExchange', 'BybitExchange'
 ]
 
-def create_exchange(exchange_name: str, api_key: str, api_secret: str, testnet: bool = True) -> BaseExchange:
+def create_exchange(exchange_name: str, api_key: str, api_secret: str, testnet: bool = True,
+                    session: Optional[aiohttp.ClientSession] = None,
+                    extra_credentials: Optional[List[Tuple[str, str]]] = None) -> BaseExchange:
     exchanges = {
         'binance': BinanceExchange,
         'okx': OKXExchange,
@@ -19,4 +25,10 @@ def create_exchange(exchange_name: str, api_key: str, api_secret: str, testnet:
     if exchange_name.lower() not in exchanges:
         raise ValueError(f"Unsupported exchange: {exchange_name}")
     
-    return exchanges[exchange_name.lower()](api_key, api_secret, testnet)
\ No newline at end of file
+    exchange_class = exchanges[exchange_name.lower()]
+    if extra_credentials:
+        if exchange_class is not BinanceExchange:
+            raise ValueError(f"Key rotation is not supported for {exchange_name}")
+        return exchange_class(api_key, api_secret, testnet, session=session,
+                              extra_credentials=extra_credentials)
+    return exchange_class(api_key, api_secret, testnet, session=session)
\ No newline at end of file
@@ -1,33 +1,51 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import time
+import aiohttp
+from loguru import logger
 
-class OrderType(Enum):
+class OrderType(str, Enum):
     MARKET = "market"
     LIMIT = "limit"
     STOP_LOSS = "stop_loss"
     TAKE_PROFIT = "take_profit"
 
-class OrderSide(Enum):
+class OrderSide(str, Enum):
     BUY = "buy"
     SELL = "sell"
 
-class OrderStatus(Enum):
+class OrderStatus(str, Enum):
     PENDING = "pending"
     FILLED = "filled"
     CANCELLED = "cancelled"
     PARTIAL = "partial"
 
-@dataclass
+# Plain dict lookups from raw exchange strings, cheaper than Enum(value) calls
+ORDER_TYPES = {member.value: member for member in OrderType}
+ORDER_SIDES = {member.value: member for member in OrderSide}
+ORDER_STATUSES = {member.value: member for member in OrderStatus}
+# ccxt's unified order statuses
+ORDER_STATUSES.update({
+    'open': OrderStatus.PENDING,
+    'closed': OrderStatus.FILLED,
+    'canceled': OrderStatus.CANCELLED,
+    'expired': OrderStatus.CANCELLED,
+    'rejected': OrderStatus.CANCELLED
+})
+# Position sides as integer codes: +1 long, -1 short, 0 for anything else
+POSITION_SIDES = {'long': 1, 'short': -1}
+
+@dataclass(slots=True)
 class Balance:
     symbol: str
     free: float
     used: float
     total: float
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     id: str
     symbol: str
@@ -36,12 +54,12 @@ class Order:
     amount: float
     price: Optional[float]
     status: OrderStatus
-    timestamp: int
+    timestamp: int  # Nanoseconds since the epoch
     filled: float = 0.0
     remaining: float = 0.0
     fee: Optional[Dict] = None
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     side: str
@@ -50,26 +68,64 @@ class Position:
     unrealized_pnl: float
     percentage: float
     leverage: int
+    side_code: int = field(init=False)
+    
+    def __post_init__(self):
+        self.side_code = POSITION_SIDES.get(self.side, 0)
 
-@dataclass
+@dataclass(slots=True)
 class Ticker:
     symbol: str
     price: float
     volume: float
     change: float
-    timestamp: int
+    timestamp: int  # Nanoseconds since the epoch
+
+def timestamp_ns(data: Dict) -> int:
+    # ccxt millisecond timestamp as nanoseconds; payloads without one (such as
+    # freshly placed conditional orders) are stamped with the local receive time
+    timestamp = data.get('timestamp')
+    if timestamp is None:
+        return time.time_ns()
+    return int(timestamp) * 1_000_000
 
 class BaseExchange(ABC):
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 session: Optional[aiohttp.ClientSession] = None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
+        # Shared HTTP connection pool for async clients; None lets the client own one
+        self.session = session
         self.name = self.__class__.__name__.lower().replace('exchange', '')
     
+    # Exchanges that can push candles over WebSocket override watch_ohlcv
+    supports_streaming = False
+    
+    def market_data_client(self):
+        # ccxt client for the next public market-data request; exchanges holding
+        # several API keys rotate through them here
+        return getattr(self, 'exchange', None)
+    
+    async def start(self, markets_refresh_interval: float = 3600):
+        # Warm caches (such as the market list) before the first order is sent
+        pass
+    
+    async def close(self):
+        # Release network resources held by async exchange clients
+        pass
+    
+    async def watch_ohlcv(self, symbol: str, timeframe: str) -> List[List[float]]:
+        # Waits for the next candle updates as [timestamp, open, high, low, close, volume] rows
+        raise NotImplementedError(f"{self.name} does not support candle streaming")
+    
     @abstractmethod
     async def get_balance(self) -> List[Balance]:
         pass
     
+    async def get_balance_map(self) -> Dict[str, Balance]:
+        return {balance.symbol: balance for balance in await self.get_balance()}
+    
     @abstractmethod
     async def get_ticker(self, symbol: str) -> Ticker:
         pass
@@ -107,4 +163,29 @@ class BaseExchange(ABC):
     @abstractmethod
     async def create_take_profit_order(self, symbol: str, side: OrderSide, 
                                      amount: float, price: float) -> Order:
-        pass
\ No newline at end of file
+        pass
+    
+    async def create_bracket_orders(self, symbol: str, side: OrderSide, order_type: OrderType,
+                                    amount: float, price: Optional[float] = None,
+                                    stop_loss: Optional[float] = None,
+                                    take_profit: Optional[float] = None) -> List[Order]:
+        # Entry first so protective orders never precede the position, then the
+        # stop loss and take profit together. Not batched with the entry: a
+        # batch sends every leg at once, so a rejected entry would leave the
+        # protective orders on the book
+        order = await self.create_order(symbol, side, order_type, amount, price)
+        
+        exit_side = OrderSide.SELL if side is OrderSide.BUY else OrderSide.BUY
+        protective = []
+        if stop_loss is not None:
+            protective.append(self.create_stop_loss_order(symbol, exit_side, amount, stop_loss))
+        if take_profit is not None:
+            protective.append(self.create_take_profit_order(symbol, exit_side, amount, take_profit))
+        
+        orders = [order]
+        for result in await asyncio.gather(*protective, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Error placing protective order for {symbol}: {result}")
+            else:
+                orders.append(result)
+        return orders
\ No newline at end of file
@@ -1,28 +1,84 @@
-import ccxt
-from typing import Dict, List, Optional
-from .base import BaseExchange, Balance, Order, Position, Ticker, OrderType, OrderSide, OrderStatus
 import asyncio
+import itertools
+import ccxt.pro as ccxt
+from typing import Dict, List, Optional, Tuple
+import aiohttp
+from .base import (BaseExchange, Balance, Order, Position, Ticker, OrderType, OrderSide,
+                   ORDER_TYPES, ORDER_SIDES, ORDER_STATUSES, timestamp_ns)
 from loguru import logger
 
 class BinanceExchange(BaseExchange):
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
-        super().__init__(api_key, api_secret, testnet)
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 extra_credentials: Optional[List[Tuple[str, str]]] = None):
+        super().__init__(api_key, api_secret, testnet, session)
         
-        self.exchange = ccxt.binance({
+        # The first key owns the account (orders, balances, positions); extra
+        # keys only add request budget for public market data. Each client
+        # keeps its own ccxt rate limiter.
+        credentials = [(api_key, api_secret)] + list(extra_credentials or [])
+        self._clients = [self._create_client(key, secret) for key, secret in credentials]
+        self._rotation = itertools.cycle(self._clients)
+        self.exchange = self._clients[0]
+        self._markets_task: Optional[asyncio.Task] = None
+    
+    def _create_client(self, api_key: str, api_secret: str) -> ccxt.binance:
+        config = {
             'apiKey': api_key,
             'secret': api_secret,
-            'sandbox': testnet,
+            'sandbox': self.testnet,
             'enableRateLimit': True,
             'options': {
-                'defaultType': 'future' if testnet else 'spot',
+                'defaultType': 'future' if self.testnet else 'spot',
             }
-        })
+        }
+        if self.session is not None:
+            # Pooled keep-alive connections; the owner of the session closes it
+            config['session'] = self.session
+        return ccxt.binance(config)
+    
+    def market_data_client(self) -> ccxt.binance:
+        return next(self._rotation)
+    
+    async def _load_markets(self, reload: bool = False):
+        # Fetch once and share the result instead of loading it per key
+        markets = await self.exchange.load_markets(reload)
+        for client in self._clients[1:]:
+            client.set_markets(markets, self.exchange.currencies)
+    
+    supports_streaming = True
+    
+    async def start(self, markets_refresh_interval: float = 3600):
+        # Symbol -> market id resolution needs the market list; load it now so
+        # no order pays for a cold load_markets, then keep it fresh in the background
+        await self._load_markets()
+        if self._markets_task is None:
+            self._markets_task = asyncio.create_task(self._refresh_markets(markets_refresh_interval))
+    
+    async def _refresh_markets(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._load_markets(reload=True)
+            except Exception as e:
+                logger.warning(f"Error refreshing Binance markets: {e}")
+    
+    async def close(self):
+        if self._markets_task is not None:
+            self._markets_task.cancel()
+            self._markets_task = None
+        await asyncio.gather(*[client.close() for client in self._clients])
+    
+    async def watch_ohlcv(self, symbol: str, timeframe: str) -> List[List[float]]:
+        try:
+            return await self.exchange.watch_ohlcv(symbol, timeframe)
+        except Exception as e:
+            logger.error(f"Error watching {timeframe} candles for {symbol} on Binance: {e}")
+            raise
     
     async def get_balance(self) -> List[Balance]:
         try:
-            balance_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_balance
-            )
+            balance_data = await self.exchange.fetch_balance()
             
             balances = []
             for symbol, data in balance_data.items():
@@ -41,16 +97,14 @@ class BinanceExchange(BaseExchange):
     
     async def get_ticker(self, symbol: str) -> Ticker:
         try:
-            ticker_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_ticker, symbol
-            )
+            ticker_data = await self.market_data_client().fetch_ticker(symbol)
             
             return Ticker(
                 symbol=symbol,
                 price=float(ticker_data['last']),
                 volume=float(ticker_data['baseVolume']),
                 change=float(ticker_data['percentage']),
-                timestamp=int(ticker_data['timestamp'])
+                timestamp=timestamp_ns(ticker_data)
             )
         except Exception as e:
             logger.error(f"Error fetching ticker for {symbol} from Binance: {e}")
@@ -69,9 +123,7 @@ class BinanceExchange(BaseExchange):
             if price is not None:
                 order_params['price'] = price
             
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, **order_params
-            )
+            order_data = await self.exchange.create_order(**order_params)
             
             return Order(
                 id=str(order_data['id']),
@@ -80,8 +132,8 @@ class BinanceExchange(BaseExchange):
                 type=order_type,
                 amount=amount,
                 price=price,
-                status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                status=ORDER_STATUSES[order_data['status']],
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -91,9 +143,7 @@ class BinanceExchange(BaseExchange):
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.cancel_order, order_id, symbol
-            )
+            await self.exchange.cancel_order(order_id, symbol)
             return True
         except Exception as e:
             logger.error(f"Error cancelling order {order_id} on Binance: {e}")
@@ -101,9 +151,7 @@ class BinanceExchange(BaseExchange):
     
     async def get_order(self, order_id: str, symbol: str) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_order, order_id, symbol
-            )
+            order_data = await self.exchange.fetch_order(order_id, symbol)
             
             return Order(
                 id=str(order_data['id']),
@@ -112,8 +160,8 @@ class BinanceExchange(BaseExchange):
                 type=OrderType(order_data['type']),
                 amount=float(order_data['amount']),
                 price=float(order_data['price']) if order_data['price'] else None,
-                status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                status=ORDER_STATUSES[order_data['status']],
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -123,35 +171,36 @@ class BinanceExchange(BaseExchange):
     
     async def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
         try:
-            orders_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_open_orders, symbol
-            )
-            
-            orders = []
-            for order_data in orders_data:
-                orders.append(Order(
-                    id=str(order_data['id']),
-                    symbol=order_data['symbol'],
-                    side=OrderSide(order_data['side']),
-                    type=OrderType(order_data['type']),
-                    amount=float(order_data['amount']),
-                    price=float(order_data['price']) if order_data['price'] else None,
-                    status=OrderStatus(order_data['status']),
-                    timestamp=int(order_data['timestamp']),
-                    filled=float(order_data['filled']),
-                    remaining=float(order_data['remaining'])
-                ))
+            orders_data = await self.exchange.fetch_open_orders(symbol)
             
-            return orders
+            # Resolve enum members through local dict lookups inside the loop
+            sides = ORDER_SIDES
+            types = ORDER_TYPES
+            statuses = ORDER_STATUSES
+            # Positional Order(...) arguments in field order: keyword binding
+            # dominated the per-order cost on large books
+            return [
+                Order(
+                    str(order_data['id']),
+                    order_data['symbol'],
+                    sides[order_data['side']],
+                    types[order_data['type']],
+                    float(order_data['amount']),
+                    float(order_data['price']) if order_data['price'] else None,
+                    statuses[order_data['status']],
+                    timestamp_ns(order_data),
+                    float(order_data['filled']),
+                    float(order_data['remaining'])
+                )
+                for order_data in orders_data
+            ]
         except Exception as e:
             logger.error(f"Error fetching open orders from Binance: {e}")
             raise
     
     async def get_positions(self) -> List[Position]:
         try:
-            positions_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_positions
-            )
+            positions_data = await self.exchange.fetch_positions()
             
             positions = []
             for pos_data in positions_data:
@@ -173,9 +222,7 @@ class BinanceExchange(BaseExchange):
     
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.set_leverage, leverage, symbol
-            )
+            await self.exchange.set_leverage(leverage, symbol)
             return True
         except Exception as e:
             logger.error(f"Error setting leverage for {symbol} on Binance: {e}")
@@ -184,10 +231,8 @@ class BinanceExchange(BaseExchange):
     async def create_stop_loss_order(self, symbol: str, side: OrderSide, 
                                    amount: float, stop_price: float) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, symbol, 'stop_market', side.value, amount, None, None, {
-                    'stopPrice': stop_price
-                }
+            order_data = await self.exchange.create_order(
+                symbol, 'stop_market', side.value, amount, None, {'stopPrice': stop_price}
             )
             
             return Order(
@@ -197,8 +242,8 @@ class BinanceExchange(BaseExchange):
                 type=OrderType.STOP_LOSS,
                 amount=amount,
                 price=stop_price,
-                status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                status=ORDER_STATUSES[order_data['status']],
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -209,10 +254,8 @@ class BinanceExchange(BaseExchange):
     async def create_take_profit_order(self, symbol: str, side: OrderSide, 
                                      amount: float, price: float) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, symbol, 'take_profit_market', side.value, amount, None, None, {
-                    'stopPrice': price
-                }
+            order_data = await self.exchange.create_order(
+                symbol, 'take_profit_market', side.value, amount, None, {'stopPrice': price}
             )
             
             return Order(
@@ -222,8 +265,8 @@ class BinanceExchange(BaseExchange):
                 type=OrderType.TAKE_PROFIT,
                 amount=amount,
                 price=price,
-                status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                status=ORDER_STATUSES[order_data['status']],
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
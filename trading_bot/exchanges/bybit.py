@@ -1,25 +1,31 @@
-import ccxt
+import ccxt.async_support as ccxt
 from typing import Dict, List, Optional
-from .base import BaseExchange, Balance, Order, Position, Ticker, OrderType, OrderSide, OrderStatus
-import asyncio
+import aiohttp
+from .base import BaseExchange, Balance, Order, Position, Ticker, OrderType, OrderSide, OrderStatus, timestamp_ns
 from loguru import logger
 
 class BybitExchange(BaseExchange):
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True):
-        super().__init__(api_key, api_secret, testnet)
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 session: Optional[aiohttp.ClientSession] = None):
+        super().__init__(api_key, api_secret, testnet, session)
         
-        self.exchange = ccxt.bybit({
+        config = {
             'apiKey': api_key,
             'secret': api_secret,
             'sandbox': testnet,
             'enableRateLimit': True,
-        })
+        }
+        if session is not None:
+            # Pooled keep-alive connections; the owner of the session closes it
+            config['session'] = session
+        self.exchange = ccxt.bybit(config)
+    
+    async def close(self):
+        await self.exchange.close()
     
     async def get_balance(self) -> List[Balance]:
         try:
-            balance_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_balance
-            )
+            balance_data = await self.exchange.fetch_balance()
             
             balances = []
             for symbol, data in balance_data.items():
@@ -38,16 +44,14 @@ class BybitExchange(BaseExchange):
     
     async def get_ticker(self, symbol: str) -> Ticker:
         try:
-            ticker_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_ticker, symbol
-            )
+            ticker_data = await self.exchange.fetch_ticker(symbol)
             
             return Ticker(
                 symbol=symbol,
                 price=float(ticker_data['last']),
                 volume=float(ticker_data['baseVolume']),
                 change=float(ticker_data['percentage']),
-                timestamp=int(ticker_data['timestamp'])
+                timestamp=timestamp_ns(ticker_data)
             )
         except Exception as e:
             logger.error(f"Error fetching ticker for {symbol} from Bybit: {e}")
@@ -66,9 +70,7 @@ class BybitExchange(BaseExchange):
             if price is not None:
                 order_params['price'] = price
             
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, **order_params
-            )
+            order_data = await self.exchange.create_order(**order_params)
             
             return Order(
                 id=str(order_data['id']),
@@ -78,7 +80,7 @@ class BybitExchange(BaseExchange):
                 amount=amount,
                 price=price,
                 status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -88,9 +90,7 @@ class BybitExchange(BaseExchange):
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.cancel_order, order_id, symbol
-            )
+            await self.exchange.cancel_order(order_id, symbol)
             return True
         except Exception as e:
             logger.error(f"Error cancelling order {order_id} on Bybit: {e}")
@@ -98,9 +98,7 @@ class BybitExchange(BaseExchange):
     
     async def get_order(self, order_id: str, symbol: str) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_order, order_id, symbol
-            )
+            order_data = await self.exchange.fetch_order(order_id, symbol)
             
             return Order(
                 id=str(order_data['id']),
@@ -110,7 +108,7 @@ class BybitExchange(BaseExchange):
                 amount=float(order_data['amount']),
                 price=float(order_data['price']) if order_data['price'] else None,
                 status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -120,9 +118,7 @@ class BybitExchange(BaseExchange):
     
     async def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
         try:
-            orders_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_open_orders, symbol
-            )
+            orders_data = await self.exchange.fetch_open_orders(symbol)
             
             orders = []
             for order_data in orders_data:
@@ -134,7 +130,7 @@ class BybitExchange(BaseExchange):
                     amount=float(order_data['amount']),
                     price=float(order_data['price']) if order_data['price'] else None,
                     status=OrderStatus(order_data['status']),
-                    timestamp=int(order_data['timestamp']),
+                    timestamp=timestamp_ns(order_data),
                     filled=float(order_data['filled']),
                     remaining=float(order_data['remaining'])
                 ))
@@ -146,9 +142,7 @@ class BybitExchange(BaseExchange):
     
     async def get_positions(self) -> List[Position]:
         try:
-            positions_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_positions
-            )
+            positions_data = await self.exchange.fetch_positions()
             
             positions = []
             for pos_data in positions_data:
@@ -170,9 +164,7 @@ class BybitExchange(BaseExchange):
     
     async def set_leverage(self, symbol: str, leverage: int) -> bool:
         try:
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.set_leverage, leverage, symbol
-            )
+            await self.exchange.set_leverage(leverage, symbol)
             return True
         except Exception as e:
             logger.error(f"Error setting leverage for {symbol} on Bybit: {e}")
@@ -181,11 +173,9 @@ class BybitExchange(BaseExchange):
     async def create_stop_loss_order(self, symbol: str, side: OrderSide, 
                                    amount: float, stop_price: float) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, symbol, 'market', side.value, amount, None, None, {
-                    'stopLoss': stop_price
-                }
-            )
+            order_data = await self.exchange.create_order(symbol, 'market', side.value, amount, None, None, {
+                'stopLoss': stop_price
+            })
             
             return Order(
                 id=str(order_data['id']),
@@ -195,7 +185,7 @@ class BybitExchange(BaseExchange):
                 amount=amount,
                 price=stop_price,
                 status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -206,11 +196,9 @@ class BybitExchange(BaseExchange):
     async def create_take_profit_order(self, symbol: str, side: OrderSide, 
                                      amount: float, price: float) -> Order:
         try:
-            order_data = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.create_order, symbol, 'market', side.value, amount, None, None, {
-                    'takeProfit': price
-                }
-            )
+            order_data = await self.exchange.create_order(symbol, 'market', side.value, amount, None, None, {
+                'takeProfit': price
+            })
             
             return Order(
                 id=str(order_data['id']),
@@ -220,7 +208,7 @@ class BybitExchange(BaseExchange):
                 amount=amount,
                 price=price,
                 status=OrderStatus(order_data['status']),
-                timestamp=int(order_data['timestamp']),
+                timestamp=timestamp_ns(order_data),
                 filled=float(order_data['filled']),
                 remaining=float(order_data['remaining'])
             )
@@ -1,10 +1,11 @@
 from .base import BaseStrategy, TradingSignal, SignalType, MarketData
+from .indicator_cache import IndicatorCache
 from .ma_crossover import MACrossoverStrategy
 from .rsi_strategy import RSIStrategy
 
 __all__ = [
     'BaseStrategy', 'TradingSignal', 'SignalType', 'MarketData',
-    'MACrossoverStrategy', 'RSIStrategy'
+    'MACrossoverStrategy', 'RSIStrategy', 'IndicatorCache'
 ]
 
 def get_strategy(strategy_name: str, **kwargs) -> BaseStrategy:
@@ -1,20 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass
-from enum import Enum
-import pandas as pd
+from enum import IntEnum
+import numpy as np
 from datetime import datetime
 
 from ..exchanges.base import BaseExchange, Order, Position, OrderSide, OrderType
+from .indicator_cache import IndicatorCache
 
-class SignalType(Enum):
-    BUY = "buy"
-    SELL = "sell"
-    HOLD = "hold"
-    CLOSE_LONG = "close_long"
-    CLOSE_SHORT = "close_short"
+class SignalType(IntEnum):
+    HOLD = 0
+    BUY = 1
+    SELL = 2
+    CLOSE_LONG = 3
+    CLOSE_SHORT = 4
 
-@dataclass
+# Plain int codes for hot comparisons, avoiding enum attribute lookups
+BUY = int(SignalType.BUY)
+SELL = int(SignalType.SELL)
+CLOSE_LONG = int(SignalType.CLOSE_LONG)
+CLOSE_SHORT = int(SignalType.CLOSE_SHORT)
+
+@dataclass(slots=True)
 class TradingSignal:
     symbol: str
     signal_type: SignalType
@@ -27,7 +36,7 @@ class TradingSignal:
     leverage: int = 1
     metadata: Dict[str, Any] = None
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     symbol: str
     timestamp: datetime
@@ -37,18 +46,64 @@ class MarketData:
     close: float
     volume: float
 
+# Candles kept per symbol; older bars fall off the ring buffer
+MAX_MARKET_DATA = 1000
+
+# Signal history as fixed-size records (timestamp in epoch seconds, NaN for
+# a missing stop loss / take profit); symbols are interned to integer ids
+SIGNAL_DTYPE = np.dtype([
+    ('symbol_id', np.int32),
+    ('signal_type', np.int8),
+    ('price', np.float64),
+    ('amount', np.float64),
+    ('confidence', np.float64),
+    ('timestamp', np.float64),
+    ('stop_loss', np.float64),
+    ('take_profit', np.float64),
+    ('leverage', np.int32),
+])
+
+# Signals kept per strategy; once the buffer fills the older half is dropped
+MAX_SIGNALS = 4096
+
 class BaseStrategy(ABC):
+    # Order size used for entries generated by analyze_batch
+    batch_amount: float = 1.0
+    
     def __init__(self, name: str, parameters: Dict[str, Any] = None):
         self.name = name
         self.parameters = parameters or {}
         self.positions: Dict[str, Position] = {}
-        self.market_data: Dict[str, List[MarketData]] = {}
-        self.signals: List[TradingSignal] = []
-        
+        self.market_data: Dict[str, Deque[MarketData]] = {}
+        # Streaming indicators; the trading engine swaps in a cache shared with
+        # strategies that are fed the same timeframes
+        self.indicator_cache = IndicatorCache()
+        # Signal records carry symbol_id; symbol_names[symbol_id] maps it back
+        self.symbol_ids: Dict[str, int] = {}
+        self.symbol_names: List[str] = []
+        self._signals = np.empty(MAX_SIGNALS, dtype=SIGNAL_DTYPE)
+        self._n_signals = 0
+    
     @abstractmethod
     def analyze(self, symbol: str, market_data: List[MarketData]) -> TradingSignal:
         pass
     
+    # Optional vectorized fast path: one int8 SignalType code per bar of the
+    # struct-of-arrays history, or None if only per-bar analyze() is supported
+    def analyze_batch(self, symbol: str, arrays: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+        return None
+    
+    # analyze_batch for several symbols at once; strategies can override this to
+    # evaluate the symbols in parallel. None if any symbol lacks a fast path.
+    def analyze_batch_symbols(self, arrays: Dict[str, Dict[str, np.ndarray]]) -> Optional[Dict[str, np.ndarray]]:
+        signals = {}
+        for symbol, symbol_arrays in arrays.items():
+            symbol_signals = self.analyze_batch(symbol, symbol_arrays)
+            if symbol_signals is None:
+                return None
+            signals[symbol] = symbol_signals
+        return signals
+    
     @abstractmethod
     def get_required_timeframes(self) -> List[str]:
         pass
@@ -57,36 +112,75 @@ class BaseStrategy(ABC):
     def get_required_indicators(self) -> List[str]:
         pass
     
-    def add_market_data(self, symbol: str, data: List[MarketData]):
-        if symbol not in self.market_data:
-            self.market_data[symbol] = []
-        self.market_data[symbol].extend(data)
-        
-        # Keep only last 1000 candles to manage memory
-        if len(self.market_data[symbol]) > 1000:
-            self.market_data[symbol] = self.market_data[symbol][-1000:]
+    def on_bar(self, symbol: str, bar: MarketData):
+        # Called once per new candle; incremental strategies extend this to
+        # update streaming indicator state before delegating here
+        buffer = self.market_data.get(symbol)
+        if buffer is None:
+            buffer = self.market_data[symbol] = deque(maxlen=MAX_MARKET_DATA)
+        buffer.append(bar)
+    
+    def add_market_data(self, symbol: str, data: List[MarketData]) -> int:
+        # Skip candles already seen so overlapping fetches are not double counted;
+        # returns how many were appended
+        buffer = self.market_data.get(symbol)
+        last_timestamp = buffer[-1].timestamp if buffer else None
+        appended = 0
+        for bar in data:
+            if last_timestamp is None or bar.timestamp > last_timestamp:
+                self.on_bar(symbol, bar)
+                last_timestamp = bar.timestamp
+                appended += 1
+        return appended
     
     def get_market_data(self, symbol: str, limit: Optional[int] = None) -> List[MarketData]:
-        data = self.market_data.get(symbol, [])
-        if limit:
-            return data[-limit:]
-        return data
+        data = self.market_data.get(symbol)
+        if not data:
+            return []
+        if limit and limit < len(data):
+            # Walk back from the newest bar instead of copying the whole buffer
+            window = list(islice(reversed(data), limit))
+            window.reverse()
+            return window
+        return list(data)
     
     def update_position(self, symbol: str, position: Position):
         self.positions[symbol] = position
     
+    def remove_position(self, symbol: str):
+        self.positions.pop(symbol, None)
+    
     def get_position(self, symbol: str) -> Optional[Position]:
         return self.positions.get(symbol)
     
     def add_signal(self, signal: TradingSignal):
-        self.signals.append(signal)
+        if self._n_signals == MAX_SIGNALS:
+            keep = MAX_SIGNALS // 2
+            self._signals[:keep] = self._signals[MAX_SIGNALS - keep:]
+            self._n_signals = keep
+        symbol_id = self.symbol_ids.get(signal.symbol)
+        if symbol_id is None:
+            symbol_id = self.symbol_ids[signal.symbol] = len(self.symbol_names)
+            self.symbol_names.append(signal.symbol)
+        self._signals[self._n_signals] = (
+            symbol_id, signal.signal_type, signal.price, signal.amount, signal.confidence,
+            signal.timestamp.timestamp(),
+            np.nan if signal.stop_loss is None else signal.stop_loss,
+            np.nan if signal.take_profit is None else signal.take_profit,
+            signal.leverage
+        )
+        self._n_signals += 1
     
-    def get_recent_signals(self, symbol: str = None, limit: int = 10) -> List[TradingSignal]:
+    def get_recent_signals(self, symbol: str = None, limit: int = 10) -> np.ndarray:
+        # SIGNAL_DTYPE records, oldest first. Always a copy: add_signal compacts
+        # the buffer in place once it fills, which would rewrite a view
+        signals = self._signals[:self._n_signals]
         if symbol:
-            signals = [s for s in self.signals if s.symbol == symbol]
-        else:
-            signals = self.signals
-        return signals[-limit:]
+            symbol_id = self.symbol_ids.get(symbol)
+            if symbol_id is None:
+                return signals[:0].copy()
+            signals = signals[signals['symbol_id'] == symbol_id]
+        return signals[-limit:].copy()
     
     def calculate_position_size(self, signal: TradingSignal, account_balance: float, 
                               risk_per_trade: float = 0.02) -> float:
@@ -107,8 +201,10 @@ class BaseStrategy(ABC):
         
         current_position = self.get_position(signal.symbol)
         if current_position and current_position.size > 0:
-            if (signal.signal_type == SignalType.BUY and current_position.side == "long") or \
-               (signal.signal_type == SignalType.SELL and current_position.side == "short"):
+            # Integer compares only: SignalType is an IntEnum, side_code is +1/-1
+            signal_type = signal.signal_type
+            side = current_position.side_code
+            if (signal_type == BUY and side > 0) or (signal_type == SELL and side < 0):
                 return False
         
         return True
@@ -118,9 +214,6 @@ class BaseStrategy(ABC):
         if not current_position or current_position.size == 0:
             return False
         
-        if signal.signal_type == SignalType.CLOSE_LONG and current_position.side == "long":
-            return True
-        elif signal.signal_type == SignalType.CLOSE_SHORT and current_position.side == "short":
-            return True
-        
-        return False
\ No newline at end of file
+        signal_type = signal.signal_type
+        side = current_position.side_code
+        return (signal_type == CLOSE_LONG and side > 0) or (signal_type == CLOSE_SHORT and side < 0)
\ No newline at end of file
@@ -0,0 +1,39 @@
+import math
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Streaming indicators shared by strategies that receive the same candles, so
+# two strategies reading RSI(14) on one symbol advance it once per bar.
+
+class SharedIndicator:
+    def __init__(self, indicator):
+        self.indicator = indicator
+        # Latest reading (what update returned) and the one before it
+        self.value = math.nan
+        self.previous = math.nan
+        self.timestamp: Optional[datetime] = None
+    
+    def update(self, timestamp: datetime, x: float):
+        # A bar at or before the last one applied was already counted by
+        # another strategy sharing this indicator
+        if self.timestamp is not None and timestamp <= self.timestamp:
+            return
+        self.previous = self.value
+        self.value = self.indicator.update(x)
+        self.timestamp = timestamp
+    
+    def __getattr__(self, name: str):
+        # Extra readings such as MACD's signal line or the Bollinger bands
+        return getattr(self.indicator, name)
+
+class IndicatorCache:
+    def __init__(self):
+        self._indicators: Dict[Tuple[str, str, type, tuple], SharedIndicator] = {}
+    
+    def get(self, symbol: str, source: str, indicator_type: type, *params) -> SharedIndicator:
+        # One instance per symbol, input field ('close', 'volume', ...) and parameters
+        key = (symbol, source, indicator_type, params)
+        shared = self._indicators.get(key)
+        if shared is None:
+            shared = self._indicators[key] = SharedIndicator(indicator_type(*params))
+        return shared
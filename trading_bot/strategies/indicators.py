@@ -0,0 +1,181 @@
+import math
+from collections import deque
+
+# O(1)-per-bar indicators for strategies that update on every new candle.
+# Each exposes update(value) and the latest reading as .value (NaN while warming up).
+
+class StreamingSMA:
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.value = math.nan
+    
+    def update(self, x: float) -> float:
+        window = self.window
+        if len(window) == self.period:
+            self.total -= window[0]
+        window.append(x)
+        self.total += x
+        if len(window) == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+class StreamingEMA:
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.value = math.nan
+    
+    def update(self, x: float) -> float:
+        # Seeded with the simple average of the first period values, like talib
+        if self.count < self.period:
+            self.count += 1
+            self.value = x if self.count == 1 else self.value + (x - self.value) / self.count
+            if self.count < self.period:
+                return math.nan
+            return self.value
+        self.value += self.alpha * (x - self.value)
+        return self.value
+
+class StreamingRSI:
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = math.nan
+    
+    def update(self, close: float) -> float:
+        if self.prev_close is None:
+            self.prev_close = close
+            return self.value
+        
+        change = close - self.prev_close
+        self.prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        period = self.period
+        
+        # Simple average over the first period changes, then Wilder smoothing
+        if self.count < period:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            self.count += 1
+            if self.count < period:
+                return self.value
+            self.avg_gain /= period
+            self.avg_loss /= period
+        else:
+            self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+            self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+        
+        total = self.avg_gain + self.avg_loss
+        self.value = 100.0 * self.avg_gain / total if total else 0.0
+        return self.value
+
+class StreamingMACD:
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal_ema = StreamingEMA(signal_period)
+        # talib seeds both EMAs on the bar the slow one completes, so the fast
+        # EMA skips the values before its own seed window
+        self.fast_skip = max(slow_period - fast_period, 0)
+        self.value = math.nan
+        self.signal = math.nan
+    
+    def update(self, close: float) -> float:
+        if self.fast_skip:
+            self.fast_skip -= 1
+            self.slow.update(close)
+            return self.value
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if math.isnan(slow):
+            return self.value
+        self.value = fast - slow
+        self.signal = self.signal_ema.update(self.value)
+        return self.value
+
+class StreamingBollinger:
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.period = period
+        self.num_std = num_std
+        self.window = deque(maxlen=period)
+        # Welford state: running mean and sum of squared deviations
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.upper = self.middle = self.lower = math.nan
+    
+    def update(self, x: float) -> float:
+        window = self.window
+        period = self.period
+        if len(window) < period:
+            window.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(window)
+            self.m2 += delta * (x - self.mean)
+        else:
+            # Slide the window: swap the oldest value for x without re-summing
+            old = window[0]
+            window.append(x)
+            old_mean = self.mean
+            self.mean += (x - old) / period
+            self.m2 += (x - old) * (x - self.mean + old - old_mean)
+        
+        if len(window) == period:
+            # Population deviation, clamped against rounding
+            std = math.sqrt(max(self.m2 / period, 0.0))
+            self.middle = self.mean
+            self.upper = self.mean + self.num_std * std
+            self.lower = self.mean - self.num_std * std
+        return self.middle
+
+class StreamingMinMax:
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        # Monotonic (index, value) deques; the front is the window's first extreme
+        self.mins = deque()
+        self.maxs = deque()
+    
+    def update(self, x: float):
+        index = self.count
+        self.count += 1
+        
+        # NaN values are skipped, like numpy's nanmin/nanmax
+        if not math.isnan(x):
+            mins = self.mins
+            while mins and mins[-1][1] > x:
+                mins.pop()
+            mins.append((index, x))
+            maxs = self.maxs
+            while maxs and maxs[-1][1] < x:
+                maxs.pop()
+            maxs.append((index, x))
+        
+        start = index - self.period + 1
+        while self.mins and self.mins[0][0] < start:
+            self.mins.popleft()
+        while self.maxs and self.maxs[0][0] < start:
+            self.maxs.popleft()
+    
+    @property
+    def min(self) -> float:
+        return self.mins[0][1] if self.mins else math.nan
+    
+    @property
+    def max(self) -> float:
+        return self.maxs[0][1] if self.maxs else math.nan
+    
+    @property
+    def argmin(self) -> float:
+        # Position of the first minimum counted from the first update
+        return self.mins[0][0] if self.mins else math.nan
+    
+    @property
+    def argmax(self) -> float:
+        return self.maxs[0][0] if self.maxs else math.nan
@@ -1,9 +1,142 @@
-import pandas as pd
-from typing import Dict, List, Any
-from datetime import datetime
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence
 import talib
 
-from .base import BaseStrategy, TradingSignal, SignalType, MarketData
+from .base import BaseStrategy, TradingSignal, SignalType, MarketData, BUY, SELL, CLOSE_LONG, CLOSE_SHORT
+from .indicators import StreamingSMA, StreamingRSI
+from .indicator_cache import IndicatorCache
+from ..utils._njit import njit, prange
+
+RSI_PERIOD = 14
+VOLUME_PERIOD = 20
+
+@njit(cache=True)
+def _sma_at(values: np.ndarray, end: int, period: int) -> float:
+    # Mean of values[end - period:end], NaN while there are too few values
+    if end < period:
+        return np.nan
+    total = 0.0
+    for i in range(end - period, end):
+        total += values[i]
+    return total / period
+
+@njit(cache=True)
+def _ma_indicators(close: np.ndarray, volume: np.ndarray, fast_period: int, slow_period: int):
+    # Same values _MAStream holds after replaying the whole window, in one pass:
+    # (fast, slow, previous fast, previous slow, RSI, volume MA)
+    n = close.shape[0]
+    
+    # Wilder RSI seeded with the simple average of the first RSI_PERIOD changes
+    rsi = np.nan
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        if i <= RSI_PERIOD:
+            avg_gain += gain
+            avg_loss += loss
+            if i < RSI_PERIOD:
+                continue
+            avg_gain /= RSI_PERIOD
+            avg_loss /= RSI_PERIOD
+        else:
+            avg_gain = (avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+            avg_loss = (avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+        total = avg_gain + avg_loss
+        rsi = 100.0 * avg_gain / total if total != 0.0 else 0.0
+    
+    return (_sma_at(close, n, fast_period), _sma_at(close, n, slow_period),
+            _sma_at(close, n - 1, fast_period), _sma_at(close, n - 1, slow_period),
+            rsi, _sma_at(volume, n, VOLUME_PERIOD))
+
+@njit(cache=True)
+def _crossover_codes(close: np.ndarray, fast_period: int, slow_period: int) -> np.ndarray:
+    # Both SMAs, the Wilder RSI and the crossover codes in one pass over close,
+    # with running sums in place of intermediate indicator arrays. The sums and
+    # averages follow talib.SMA / talib.RSI operation for operation.
+    # Codes are picked with comparison arithmetic instead of branches. NaN
+    # warm-up values compare False, so no crosses before both MAs exist, and a
+    # cross blocked by the RSI filter still exits the opposite position.
+    n = close.shape[0]
+    signals = np.zeros(n, dtype=np.int8)
+    fast_total = 0.0
+    slow_total = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    rsi = np.nan
+    previous = np.nan
+    for i in range(n):
+        x = close[i]
+        fast_ma = np.nan
+        fast_total += x
+        if i >= fast_period - 1:
+            fast_ma = fast_total / fast_period
+            fast_total -= close[i - fast_period + 1]
+        slow_ma = np.nan
+        slow_total += x
+        if i >= slow_period - 1:
+            slow_ma = slow_total / slow_period
+            slow_total -= close[i - slow_period + 1]
+        
+        if i > 0:
+            change = x - close[i - 1]
+            gain = change if change > 0.0 else 0.0
+            loss = -change if change < 0.0 else 0.0
+            if i <= RSI_PERIOD:
+                avg_gain += gain
+                avg_loss += loss
+                if i == RSI_PERIOD:
+                    avg_gain /= RSI_PERIOD
+                    avg_loss /= RSI_PERIOD
+            else:
+                avg_gain = (avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                avg_loss = (avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+            if i >= RSI_PERIOD:
+                total = avg_gain + avg_loss
+                rsi = 100.0 * (avg_gain / total) if abs(total) >= 1e-14 else 0.0
+        
+        spread = fast_ma - slow_ma
+        golden = (previous <= 0.0) & (spread > 0.0)
+        death = (previous >= 0.0) & (spread < 0.0)
+        signals[i] = (golden * (CLOSE_SHORT + (BUY - CLOSE_SHORT) * (rsi < 70.0))
+                      + death * (CLOSE_LONG + (SELL - CLOSE_LONG) * (rsi > 30.0)))
+        previous = spread
+    return signals
+
+@njit(parallel=True, nogil=True, cache=True)
+def _crossover_codes_many(close: np.ndarray, offsets: np.ndarray, fast_period: int,
+                          slow_period: int) -> np.ndarray:
+    # Symbols are packed back to back in close, symbol s spanning
+    # offsets[s]:offsets[s + 1]; each symbol runs on its own thread.
+    signals = np.zeros(close.shape[0], dtype=np.int8)
+    for s in prange(offsets.shape[0] - 1):
+        signals[offsets[s]:offsets[s + 1]] = _crossover_codes(
+            close[offsets[s]:offsets[s + 1]], fast_period, slow_period)
+    return signals
+
+class _MAStream:
+    def __init__(self, symbol: str, fast_period: int, slow_period: int, cache: IndicatorCache):
+        self.fast_ma = cache.get(symbol, 'close', StreamingSMA, fast_period)
+        self.slow_ma = cache.get(symbol, 'close', StreamingSMA, slow_period)
+        self.rsi = cache.get(symbol, 'close', StreamingRSI, RSI_PERIOD)
+        self.volume_ma = cache.get(symbol, 'volume', StreamingSMA, VOLUME_PERIOD)
+        self.bar = None
+    
+    def update(self, bar: MarketData):
+        timestamp = bar.timestamp
+        self.fast_ma.update(timestamp, bar.close)
+        self.slow_ma.update(timestamp, bar.close)
+        self.rsi.update(timestamp, bar.close)
+        self.volume_ma.update(timestamp, bar.volume)
+        self.bar = bar
+    
+    def is_current(self, bar: MarketData) -> bool:
+        # Shared indicators run ahead if another strategy got a newer bar first
+        timestamp = bar.timestamp
+        return (self.bar is bar and self.fast_ma.timestamp == timestamp and self.slow_ma.timestamp == timestamp
+                and self.rsi.timestamp == timestamp and self.volume_ma.timestamp == timestamp)
 
 class MACrossoverStrategy(BaseStrategy):
     def __init__(self, fast_period: int = 10, slow_period: int = 20, confidence_threshold: float = 0.7):
@@ -15,6 +148,30 @@ class MACrossoverStrategy(BaseStrategy):
         self.fast_period = fast_period
         self.slow_period = slow_period
         self.confidence_threshold = confidence_threshold
+        self._streams: Dict[str, _MAStream] = {}
+        # Compile (or load the cached) kernels now rather than on the first signal
+        _ma_indicators(np.zeros(2), np.zeros(2), fast_period, slow_period)
+        _crossover_codes(np.zeros(2), fast_period, slow_period)
+    
+    def on_bar(self, symbol: str, bar: MarketData):
+        super().on_bar(symbol, bar)
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = _MAStream(symbol, self.fast_period, self.slow_period,
+                                                       self.indicator_cache)
+        stream.update(bar)
+    
+    def _indicators(self, symbol: str, market_data: List[MarketData]) -> tuple:
+        stream = self._streams.get(symbol)
+        if stream is not None and stream.is_current(market_data[-1]):
+            return (stream.fast_ma.value, stream.slow_ma.value, stream.fast_ma.previous,
+                    stream.slow_ma.previous, stream.rsi.value, stream.volume_ma.value)
+        
+        # Data that did not arrive through on_bar: compute over the whole window
+        count = len(market_data)
+        close = np.fromiter((bar.close for bar in market_data), dtype=np.float64, count=count)
+        volume = np.fromiter((bar.volume for bar in market_data), dtype=np.float64, count=count)
+        return _ma_indicators(close, volume, self.fast_period, self.slow_period)
     
     def get_required_timeframes(self) -> List[str]:
         return ["1h", "4h"]
@@ -30,36 +187,14 @@ class MACrossoverStrategy(BaseStrategy):
                 price=market_data[-1].close,
                 amount=0,
                 confidence=0.0,
-                timestamp=datetime.now()
+                timestamp=market_data[-1].timestamp
             )
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame([
-            {
-                'timestamp': data.timestamp,
-                'open': data.open,
-                'high': data.high,
-                'low': data.low,
-                'close': data.close,
-                'volume': data.volume
-            } for data in market_data
-        ])
-        
-        # Calculate moving averages
-        df['fast_ma'] = talib.SMA(df['close'].values, timeperiod=self.fast_period)
-        df['slow_ma'] = talib.SMA(df['close'].values, timeperiod=self.slow_period)
-        df['rsi'] = talib.RSI(df['close'].values, timeperiod=14)
-        
-        # Get latest values
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
-        
-        current_price = current['close']
-        fast_ma_current = current['fast_ma']
-        slow_ma_current = current['slow_ma']
-        fast_ma_previous = previous['fast_ma']
-        slow_ma_previous = previous['slow_ma']
-        rsi = current['rsi']
+        # Indicators are kept current bar by bar through on_bar
+        (fast_ma_current, slow_ma_current, fast_ma_previous, slow_ma_previous,
+         rsi, volume_ma) = self._indicators(symbol, market_data)
+        current = market_data[-1]
+        current_price = current.close
         
         # Determine signal
         signal_type = SignalType.HOLD
@@ -74,18 +209,18 @@ class MACrossoverStrategy(BaseStrategy):
             rsi < 70):  # Not overbought
             
             signal_type = SignalType.BUY
-            confidence = self._calculate_confidence(df, "buy")
+            confidence = self._calculate_confidence(market_data, rsi, volume_ma, "buy")
             amount = 1.0
             stop_loss = current_price * 0.98  # 2% stop loss
             take_profit = current_price * 1.04  # 4% take profit
-            
+        
         # Death cross (fast MA crosses below slow MA)
         elif (fast_ma_previous >= slow_ma_previous and 
               fast_ma_current < slow_ma_current and
               rsi > 30):  # Not oversold
             
             signal_type = SignalType.SELL
-            confidence = self._calculate_confidence(df, "sell")
+            confidence = self._calculate_confidence(market_data, rsi, volume_ma, "sell")
             amount = 1.0
             stop_loss = current_price * 1.02  # 2% stop loss
             take_profit = current_price * 0.96  # 4% take profit
@@ -93,58 +228,113 @@ class MACrossoverStrategy(BaseStrategy):
         # Check for position exit signals
         current_position = self.get_position(symbol)
         if current_position and current_position.size > 0:
-            if (current_position.side == "long" and 
+            if (current_position.side_code > 0 and 
                 fast_ma_current < slow_ma_current and
                 fast_ma_previous >= slow_ma_previous):
                 signal_type = SignalType.CLOSE_LONG
                 confidence = 0.8
                 amount = current_position.size
-                
-            elif (current_position.side == "short" and 
+            
+            elif (current_position.side_code < 0 and 
                   fast_ma_current > slow_ma_current and
                   fast_ma_previous <= slow_ma_previous):
                 signal_type = SignalType.CLOSE_SHORT
                 confidence = 0.8
                 amount = current_position.size
         
+        # Indicator snapshot only for actionable signals; most bars are HOLDs
+        metadata = None
+        if signal_type is not SignalType.HOLD:
+            metadata = {
+                'fast_ma': fast_ma_current,
+                'slow_ma': slow_ma_current,
+                'rsi': rsi,
+                'volume': current.volume
+            }
+        
         return TradingSignal(
             symbol=symbol,
             signal_type=signal_type,
             price=current_price,
             amount=amount,
             confidence=confidence,
-            timestamp=datetime.now(),
+            timestamp=current.timestamp,
             stop_loss=stop_loss,
             take_profit=take_profit,
-            metadata={
-                'fast_ma': fast_ma_current,
-                'slow_ma': slow_ma_current,
-                'rsi': rsi,
-                'volume': current['volume']
-            }
+            metadata=metadata
         )
     
-    def _calculate_confidence(self, df: pd.DataFrame, signal_direction: str) -> float:
+    def analyze_batch(self, symbol: str, arrays: Dict[str, np.ndarray]) -> Optional[np.ndarray]:
+        close = np.ascontiguousarray(arrays['close'], dtype=np.float64)
+        return _crossover_codes(close, self.fast_period, self.slow_period)
+    
+    def analyze_batch_symbols(self, arrays: Dict[str, Dict[str, np.ndarray]]) -> Optional[Dict[str, np.ndarray]]:
+        if len(arrays) < 2:
+            return super().analyze_batch_symbols(arrays)
+        
+        # Pack every symbol's closes into one buffer and fan the symbols out
+        # over threads in a single kernel call
+        symbols = list(arrays)
+        lengths = [len(arrays[symbol]['close']) for symbol in symbols]
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        close = np.concatenate([arrays[symbol]['close'] for symbol in symbols]).astype(np.float64, copy=False)
+        signals = _crossover_codes_many(close, offsets, self.fast_period, self.slow_period)
+        return {symbol: signals[offsets[i]:offsets[i + 1]] for i, symbol in enumerate(symbols)}
+    
+    @classmethod
+    def sweep_signals(cls, close: np.ndarray, fast_periods: Sequence[int],
+                      slow_periods: Sequence[int]) -> np.ndarray:
+        # analyze_batch for every (fast, slow) pair in one NumPy pass: int8 codes
+        # shaped (bars, len(fast_periods), len(slow_periods)). codes[-1] is the
+        # latest signal per pair; codes == BUY / SELL give entry masks.
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        fast_periods = np.asarray(fast_periods)
+        slow_periods = np.asarray(slow_periods)
+        windows, inverse = np.unique(np.concatenate([fast_periods, slow_periods]), return_inverse=True)
+        
+        # SMA of every distinct window from one cumulative sum, NaN during warm-up
+        cumsum = np.concatenate(([0.0], np.cumsum(close)))
+        sma = np.full((len(close), len(windows)), np.nan)
+        for column, window in enumerate(windows):
+            if window <= len(close):
+                sma[window - 1:, column] = (cumsum[window:] - cumsum[:-window]) / window
+        fast_ma = sma[:, inverse[:len(fast_periods)]]
+        slow_ma = sma[:, inverse[len(fast_periods):]]
+        
+        spread = fast_ma[:, :, None] - slow_ma[:, None, :]
+        golden = (spread[:-1] <= 0) & (spread[1:] > 0)
+        death = (spread[:-1] >= 0) & (spread[1:] < 0)
+        
+        # The RSI filter does not depend on the periods, so decide it once per bar
+        rsi = talib.RSI(close, timeperiod=RSI_PERIOD)[1:]
+        on_golden = np.where(rsi < 70, BUY, CLOSE_SHORT).astype(np.int8)[:, None, None]
+        on_death = np.where(rsi > 30, SELL, CLOSE_LONG).astype(np.int8)[:, None, None]
+        
+        codes = np.zeros(spread.shape, dtype=np.int8)
+        codes[1:] = np.where(golden, on_golden, np.where(death, on_death, 0))
+        return codes
+    
+    def _calculate_confidence(self, market_data: List[MarketData], rsi: float, volume_ma: float,
+                              signal_direction: str) -> float:
         # Base confidence
         confidence = 0.6
         
         # Check volume confirmation
-        volume_ma = df['volume'].rolling(window=20).mean()
-        if df.iloc[-1]['volume'] > volume_ma.iloc[-1] * 1.2:
+        if market_data[-1].volume > volume_ma * 1.2:
             confidence += 0.1
         
         # Check RSI levels
-        rsi = df.iloc[-1]['rsi']
         if signal_direction == "buy" and 30 < rsi < 50:
             confidence += 0.1
         elif signal_direction == "sell" and 50 < rsi < 70:
             confidence += 0.1
         
         # Check price momentum
-        price_change = (df.iloc[-1]['close'] - df.iloc[-5]['close']) / df.iloc[-5]['close']
+        price_change = (market_data[-1].close - market_data[-5].close) / market_data[-5].close
         if signal_direction == "buy" and price_change > 0:
             confidence += 0.1
         elif signal_direction == "sell" and price_change < 0:
             confidence += 0.1
         
-        return min(confidence, 1.0)
\ No newline at end of file
+        return min(confidence, 1.0)
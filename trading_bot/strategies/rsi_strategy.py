@@ -1,9 +1,62 @@
-import pandas as pd
+from collections import deque
 from typing import Dict, List, Any
-from datetime import datetime
-import talib
 
 from .base import BaseStrategy, TradingSignal, SignalType, MarketData
+from .indicators import StreamingSMA, StreamingRSI, StreamingMACD, StreamingBollinger, StreamingMinMax
+from .indicator_cache import IndicatorCache
+
+# Divergence compares the latest 20 bars with the 10 bars before them
+DIVERGENCE_LOOKBACK = 20
+DIVERGENCE_HISTORY = DIVERGENCE_LOOKBACK + 10
+
+class _DivergenceWindows:
+    # Running extremes of the recent window and of the older window behind it;
+    # values move to the older window as they leave the recent one
+    def __init__(self):
+        self.recent = StreamingMinMax(DIVERGENCE_LOOKBACK)
+        self.older = StreamingMinMax(DIVERGENCE_HISTORY - DIVERGENCE_LOOKBACK)
+        self.pending = deque(maxlen=DIVERGENCE_LOOKBACK)
+    
+    def update(self, x: float):
+        if len(self.pending) == DIVERGENCE_LOOKBACK:
+            self.older.update(self.pending[0])
+        self.pending.append(x)
+        self.recent.update(x)
+
+class _RSIStream:
+    # Fed every bar since the strategy started, so the Wilder RSI and MACD EMAs
+    # equal talib over that whole history. They can differ from talib over
+    # just the 100-bar window analyze() receives, where they restart each bar
+    def __init__(self, symbol: str, rsi_period: int, cache: IndicatorCache):
+        self.rsi = cache.get(symbol, 'close', StreamingRSI, rsi_period)
+        self.macd = cache.get(symbol, 'close', StreamingMACD)
+        self.bollinger = cache.get(symbol, 'close', StreamingBollinger)
+        self.volume_ma = cache.get(symbol, 'volume', StreamingSMA, 10)
+        self.lows = _DivergenceWindows()
+        self.highs = _DivergenceWindows()
+        self.rsi_values = _DivergenceWindows()
+        self.bar = None
+    
+    @property
+    def prev_rsi(self) -> float:
+        return self.rsi.previous
+    
+    def update(self, bar: MarketData):
+        timestamp = bar.timestamp
+        self.rsi.update(timestamp, bar.close)
+        self.rsi_values.update(self.rsi.value)
+        self.macd.update(timestamp, bar.close)
+        self.bollinger.update(timestamp, bar.close)
+        self.volume_ma.update(timestamp, bar.volume)
+        self.lows.update(bar.low)
+        self.highs.update(bar.high)
+        self.bar = bar
+    
+    def is_current(self, bar: MarketData) -> bool:
+        # Shared indicators run ahead if another strategy got a newer bar first
+        timestamp = bar.timestamp
+        return (self.bar is bar and self.rsi.timestamp == timestamp and self.macd.timestamp == timestamp
+                and self.bollinger.timestamp == timestamp and self.volume_ma.timestamp == timestamp)
 
 class RSIStrategy(BaseStrategy):
     def __init__(self, rsi_period: int = 14, oversold_level: int = 30, overbought_level: int = 70):
@@ -15,6 +68,25 @@ class RSIStrategy(BaseStrategy):
         self.rsi_period = rsi_period
         self.oversold_level = oversold_level
         self.overbought_level = overbought_level
+        self._streams: Dict[str, _RSIStream] = {}
+    
+    def on_bar(self, symbol: str, bar: MarketData):
+        super().on_bar(symbol, bar)
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = _RSIStream(symbol, self.rsi_period, self.indicator_cache)
+        stream.update(bar)
+    
+    def _stream_for(self, symbol: str, market_data: List[MarketData]) -> _RSIStream:
+        stream = self._streams.get(symbol)
+        if stream is not None and stream.is_current(market_data[-1]):
+            return stream
+        
+        # Data that did not arrive through on_bar: replay it into fresh state
+        stream = _RSIStream(symbol, self.rsi_period, IndicatorCache())
+        for bar in market_data:
+            stream.update(bar)
+        return stream
     
     def get_required_timeframes(self) -> List[str]:
         return ["1h", "4h"]
@@ -30,37 +102,20 @@ class RSIStrategy(BaseStrategy):
                 price=market_data[-1].close,
                 amount=0,
                 confidence=0.0,
-                timestamp=datetime.now()
+                timestamp=market_data[-1].timestamp
             )
         
-        # Convert to pandas DataFrame
-        df = pd.DataFrame([
-            {
-                'timestamp': data.timestamp,
-                'open': data.open,
-                'high': data.high,
-                'low': data.low,
-                'close': data.close,
-                'volume': data.volume
-            } for data in market_data
-        ])
-        
-        # Calculate indicators
-        df['rsi'] = talib.RSI(df['close'].values, timeperiod=self.rsi_period)
-        df['macd'], df['macd_signal'], df['macd_hist'] = talib.MACD(df['close'].values)
-        df['bb_upper'], df['bb_middle'], df['bb_lower'] = talib.BBANDS(df['close'].values)
-        
-        # Get latest values
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
-        
-        current_price = current['close']
-        rsi_current = current['rsi']
-        rsi_previous = previous['rsi']
-        macd_current = current['macd']
-        macd_signal_current = current['macd_signal']
-        bb_upper = current['bb_upper']
-        bb_lower = current['bb_lower']
+        # Indicators are kept current bar by bar through on_bar
+        stream = self._stream_for(symbol, market_data)
+        current = market_data[-1]
+        
+        current_price = current.close
+        rsi_current = stream.rsi.value
+        rsi_previous = stream.prev_rsi
+        macd_current = stream.macd.value
+        macd_signal_current = stream.macd.signal
+        bb_upper = stream.bollinger.upper
+        bb_lower = stream.bollinger.lower
         
         # Determine signal
         signal_type = SignalType.HOLD
@@ -75,33 +130,33 @@ class RSIStrategy(BaseStrategy):
             current_price <= bb_lower * 1.02):  # Near lower Bollinger Band
             
             signal_type = SignalType.BUY
-            confidence = self._calculate_confidence(df, "buy")
+            confidence = self._calculate_confidence(market_data, stream, "buy")
             amount = 1.0
             stop_loss = min(current_price * 0.97, bb_lower * 0.99)
             take_profit = current_price * 1.06
-            
+        
         # RSI Overbought and falling back
         elif (rsi_previous >= self.overbought_level and 
               rsi_current < self.overbought_level and
               current_price >= bb_upper * 0.98):  # Near upper Bollinger Band
             
             signal_type = SignalType.SELL
-            confidence = self._calculate_confidence(df, "sell")
+            confidence = self._calculate_confidence(market_data, stream, "sell")
             amount = 1.0
             stop_loss = max(current_price * 1.03, bb_upper * 1.01)
             take_profit = current_price * 0.94
         
         # Divergence signals
-        elif self._check_bullish_divergence(df):
+        elif self._check_bullish_divergence(market_data, stream):
             signal_type = SignalType.BUY
-            confidence = self._calculate_confidence(df, "buy") * 0.8  # Lower confidence for divergence
+            confidence = self._calculate_confidence(market_data, stream, "buy") * 0.8  # Lower confidence for divergence
             amount = 0.5  # Smaller position size
             stop_loss = current_price * 0.96
             take_profit = current_price * 1.08
-            
-        elif self._check_bearish_divergence(df):
+        
+        elif self._check_bearish_divergence(market_data, stream):
             signal_type = SignalType.SELL
-            confidence = self._calculate_confidence(df, "sell") * 0.8
+            confidence = self._calculate_confidence(market_data, stream, "sell") * 0.8
             amount = 0.5
             stop_loss = current_price * 1.04
             take_profit = current_price * 0.92
@@ -109,44 +164,50 @@ class RSIStrategy(BaseStrategy):
         # Check for position exit signals
         current_position = self.get_position(symbol)
         if current_position and current_position.size > 0:
-            if (current_position.side == "long" and 
+            if (current_position.side_code > 0 and 
                 rsi_current >= self.overbought_level):
                 signal_type = SignalType.CLOSE_LONG
                 confidence = 0.8
                 amount = current_position.size
-                
-            elif (current_position.side == "short" and 
+            
+            elif (current_position.side_code < 0 and 
                   rsi_current <= self.oversold_level):
                 signal_type = SignalType.CLOSE_SHORT
                 confidence = 0.8
                 amount = current_position.size
         
+        # Indicator snapshot only for actionable signals; most bars are HOLDs
+        metadata = None
+        if signal_type is not SignalType.HOLD:
+            metadata = {
+                'rsi': rsi_current,
+                'macd': macd_current,
+                'macd_signal': macd_signal_current,
+                'bb_upper': bb_upper,
+                'bb_lower': bb_lower,
+                'volume': current.volume
+            }
+        
         return TradingSignal(
             symbol=symbol,
             signal_type=signal_type,
             price=current_price,
             amount=amount,
             confidence=confidence,
-            timestamp=datetime.now(),
+            timestamp=current.timestamp,
             stop_loss=stop_loss,
             take_profit=take_profit,
-            metadata={
-                'rsi': rsi_current,
-                'macd': macd_current,
-                'macd_signal': macd_signal_current,
-                'bb_upper': bb_upper,
-                'bb_lower': bb_lower,
-                'volume': current['volume']
-            }
+            metadata=metadata
         )
     
-    def _calculate_confidence(self, df: pd.DataFrame, signal_direction: str) -> float:
+    def _calculate_confidence(self, market_data: List[MarketData], stream: _RSIStream,
+                              signal_direction: str) -> float:
         confidence = 0.5
         
-        current = df.iloc[-1]
-        rsi = current['rsi']
-        macd = current['macd']
-        macd_signal = current['macd_signal']
+        current = market_data[-1]
+        rsi = stream.rsi.value
+        macd = stream.macd.value
+        macd_signal = stream.macd.signal
         
         # RSI strength
         if signal_direction == "buy":
@@ -167,76 +228,63 @@ class RSIStrategy(BaseStrategy):
             confidence += 0.15
         
         # Volume confirmation
-        volume_ma = df['volume'].rolling(window=10).mean()
-        if current['volume'] > volume_ma.iloc[-1] * 1.5:
+        if current.volume > stream.volume_ma.value * 1.5:
             confidence += 0.1
         
         # Price action confirmation
         if signal_direction == "buy":
-            recent_low = df['low'].tail(5).min()
-            if current['close'] > recent_low * 1.02:
+            recent_low = min(d.low for d in market_data[-5:])
+            if current.close > recent_low * 1.02:
                 confidence += 0.1
         else:  # sell
-            recent_high = df['high'].tail(5).max()
-            if current['close'] < recent_high * 0.98:
+            recent_high = max(d.high for d in market_data[-5:])
+            if current.close < recent_high * 0.98:
                 confidence += 0.1
         
         return min(confidence, 1.0)
     
-    def _check_bullish_divergence(self, df: pd.DataFrame, lookback: int = 20) -> bool:
-        if len(df) < lookback:
+    def _check_bullish_divergence(self, market_data: List[MarketData], stream: _RSIStream) -> bool:
+        if len(market_data) < DIVERGENCE_LOOKBACK:
             return False
         
-        recent_df = df.tail(lookback)
+        lows = stream.lows
+        rsi_values = stream.rsi_values
         
         # Find recent lows in price and RSI
-        price_low_idx = recent_df['low'].idxmin()
-        rsi_low_idx = recent_df['rsi'].idxmin()
+        price_low_idx = lows.recent.argmin
+        rsi_low_idx = rsi_values.recent.argmin
         
         # Check if we have a potential divergence pattern
         if abs(price_low_idx - rsi_low_idx) > 5:
             return False
         
         # Price making lower low, RSI making higher low
-        if len(df) > lookback + 10:
-            older_df = df.iloc[-(lookback + 10):-lookback]
-            old_price_low = older_df['low'].min()
-            old_rsi_low = older_df['rsi'].min()
-            
-            current_price_low = recent_df['low'].min()
-            current_rsi_low = recent_df['rsi'].min()
-            
-            if (current_price_low < old_price_low and 
-                current_rsi_low > old_rsi_low):
+        if len(market_data) > DIVERGENCE_HISTORY:
+            if (lows.recent.min < lows.older.min and 
+                rsi_values.recent.min > rsi_values.older.min):
                 return True
         
         return False
     
-    def _check_bearish_divergence(self, df: pd.DataFrame, lookback: int = 20) -> bool:
-        if len(df) < lookback:
+    def _check_bearish_divergence(self, market_data: List[MarketData], stream: _RSIStream) -> bool:
+        if len(market_data) < DIVERGENCE_LOOKBACK:
             return False
         
-        recent_df = df.tail(lookback)
+        highs = stream.highs
+        rsi_values = stream.rsi_values
         
         # Find recent highs in price and RSI
-        price_high_idx = recent_df['high'].idxmax()
-        rsi_high_idx = recent_df['rsi'].idxmax()
+        price_high_idx = highs.recent.argmax
+        rsi_high_idx = rsi_values.recent.argmax
         
         # Check if we have a potential divergence pattern
         if abs(price_high_idx - rsi_high_idx) > 5:
             return False
         
         # Price making higher high, RSI making lower high
-        if len(df) > lookback + 10:
-            older_df = df.iloc[-(lookback + 10):-lookback]
-            old_price_high = older_df['high'].max()
-            old_rsi_high = older_df['rsi'].max()
-            
-            current_price_high = recent_df['high'].max()
-            current_rsi_high = recent_df['rsi'].max()
-            
-            if (current_price_high > old_price_high and 
-                current_rsi_high < old_rsi_high):
+        if len(market_data) > DIVERGENCE_HISTORY:
+            if (highs.recent.max > highs.older.max and 
+                rsi_values.recent.max < rsi_values.older.max):
                 return True
         
-        return False
\ No newline at end of file
+        return False
@@ -1,25 +1,62 @@
 import asyncio
-from telegram import Update, Bot
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+import time
+from telegram import Update
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from loguru import logger
 import json
 
-from ..config.settings import settings
-from ..exchanges import create_exchange, BaseExchange
+from ..config.settings import get_settings
+from ..exchanges import create_exchange, BaseExchange, OrderSide, OrderType
+
+# Seconds a read-only command reuses the previous exchange response
+BALANCE_TTL = 10.0
+POSITIONS_TTL = 5.0
+ORDERS_TTL = 5.0
+TICKER_TTL = 2.0
+# Seconds Telegram holds a getUpdates call open while idle; only commands in
+# plain messages are handled, so other update types are not requested
+POLL_TIMEOUT = 20
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+# MarkdownV2 reserved characters, each prefixed with a backslash in one
+# str.translate pass; same output as escape_markdown(text, version=2)
+MARKDOWN_V2_ESCAPES = str.maketrans({char: '\\' + char for char in '\\_*[]()~`>#+-=|{}.!'})
+
+def escape_md(value: Any) -> str:
+    return str(value).translate(MARKDOWN_V2_ESCAPES)
 
 class TradingTelegramBot:
     def __init__(self):
+        settings = get_settings()
         self.bot_token = settings.telegram.bot_token if settings.telegram else None
         self.chat_id = settings.telegram.chat_id if settings.telegram else None
-        self.allowed_users = settings.telegram.allowed_users if settings.telegram else []
+        # Notifications go to every chat in a comma-separated TELEGRAM_CHAT_ID
+        self.chat_ids = [chat for chat in (self.chat_id or "").split(",") if chat]
+        # Checked on every command, so held as a set for hashed lookups
+        self.allowed_users = frozenset(settings.telegram.allowed_users) if settings.telegram else frozenset()
         
         if not self.bot_token:
             raise ValueError("Telegram bot token not configured")
         
-        self.app = Application.builder().token(self.bot_token).build()
+        # One bot and connection pool for commands and notifications alike; sized
+        # so concurrent replies and alerts do not wait on a free connection.
+        # The rate limiter holds sends to Telegram's flood limits (30 msg/s
+        # overall, about 1 msg/s per chat) and retries on 429 responses.
+        self.app = (
+            Application.builder()
+            .token(self.bot_token)
+            .rate_limiter(AIORateLimiter(max_retries=3))
+            .connection_pool_size(256)
+            .pool_timeout(30)
+            .get_updates_connection_pool_size(16)
+            .concurrent_updates(True)
+            .build()
+        )
         self.exchanges: Dict[str, BaseExchange] = {}
+        # (exchange, endpoint, ...) -> (fetch time, task holding the response)
+        self._cache: Dict[Tuple, Tuple[float, asyncio.Task]] = {}
         
         # Initialize exchanges
         for exchange_name, config in settings.exchanges.items():
@@ -31,22 +68,42 @@ class TradingTelegramBot:
             except Exception as e:
                 logger.error(f"Failed to initialize {exchange_name}: {e}")
         
+        # Commands without an exchange argument use the first configured one
+        self._default_exchange_name = next(iter(self.exchanges), None)
+        
+        # The exchange set is fixed from here on, so /start and /help reuse one text
+        self._welcome_message = "\n🤖 *Trading Bot Started\\!*\n\n" + escape_md("""Available commands:
+/help - Show this help message
+/balance [exchange] - Show account balance
+/positions [exchange] - Show open positions
+/orders [exchange] - Show open orders
+/buy <exchange> <symbol> <amount> [price] - Place buy order
+/sell <exchange> <symbol> <amount> [price] - Place sell order
+/cancel <exchange> <order_id> <symbol> - Cancel order
+/price <exchange> <symbol> - Get current price
+/leverage <exchange> <symbol> <leverage> - Set leverage
+
+Supported exchanges: {}
+        """.format(", ".join(self.exchanges.keys())))
+        
         self._setup_handlers()
     
     def _setup_handlers(self):
-        self.app.add_handler(CommandHandler("start", self.start_command))
-        self.app.add_handler(CommandHandler("help", self.help_command))
-        self.app.add_handler(CommandHandler("balance", self.balance_command))
-        self.app.add_handler(CommandHandler("positions", self.positions_command))
-        self.app.add_handler(CommandHandler("orders", self.orders_command))
-        self.app.add_handler(CommandHandler("buy", self.buy_command))
-        self.app.add_handler(CommandHandler("sell", self.sell_command))
-        self.app.add_handler(CommandHandler("cancel", self.cancel_command))
-        self.app.add_handler(CommandHandler("price", self.price_command))
-        self.app.add_handler(CommandHandler("leverage", self.leverage_command))
+        # Handlers run as their own tasks, so a slow exchange call behind one
+        # command does not hold up the others
+        self.app.add_handler(CommandHandler("start", self.start_command, block=False))
+        self.app.add_handler(CommandHandler("help", self.help_command, block=False))
+        self.app.add_handler(CommandHandler("balance", self.balance_command, block=False))
+        self.app.add_handler(CommandHandler("positions", self.positions_command, block=False))
+        self.app.add_handler(CommandHandler("orders", self.orders_command, block=False))
+        self.app.add_handler(CommandHandler("buy", self.buy_command, block=False))
+        self.app.add_handler(CommandHandler("sell", self.sell_command, block=False))
+        self.app.add_handler(CommandHandler("cancel", self.cancel_command, block=False))
+        self.app.add_handler(CommandHandler("price", self.price_command, block=False))
+        self.app.add_handler(CommandHandler("leverage", self.leverage_command, block=False))
         
         # Handle unknown commands
-        self.app.add_handler(MessageHandler(filters.COMMAND, self.unknown_command))
+        self.app.add_handler(MessageHandler(filters.COMMAND, self.unknown_command, block=False))
     
     def _check_user_permission(self, update: Update) -> bool:
         user_id = str(update.effective_user.id)
@@ -57,29 +114,34 @@ class TradingTelegramBot:
             return False
         return True
     
+    async def _cached(self, key: Tuple, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        # Responses younger than ttl are reused, and concurrent commands share
+        # one in-flight request; failures are not cached
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < ttl:
+            return await asyncio.shield(entry[1])
+        
+        task = asyncio.ensure_future(fetch())
+        self._cache[key] = (now, task)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._cache.get(key, (None, None))[1] is task:
+                del self._cache[key]
+            raise
+    
+    def _invalidate(self, exchange_name: str):
+        # Orders and leverage changes make cached account state stale
+        for key in [key for key in self._cache if key[0] == exchange_name]:
+            del self._cache[key]
+    
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not self._check_user_permission(update):
             await update.message.reply_text("❌ Unauthorized access!")
             return
         
-        welcome_message = """
-🤖 **Trading Bot Started!**
-
-Available commands:
-/help - Show this help message
-/balance [exchange] - Show account balance
-/positions [exchange] - Show open positions
-/orders [exchange] - Show open orders
-/buy <exchange> <symbol> <amount> [price] - Place buy order
-/sell <exchange> <symbol> <amount> [price] - Place sell order
-/cancel <exchange> <order_id> <symbol> - Cancel order
-/price <exchange> <symbol> - Get current price
-/leverage <exchange> <symbol> <leverage> - Set leverage
-
-Supported exchanges: {}
-        """.format(", ".join(self.exchanges.keys()))
-        
-        await update.message.reply_text(welcome_message, parse_mode=ParseMode.MARKDOWN)
+        await update.message.reply_text(self._welcome_message, parse_mode=ParseMode.MARKDOWN_V2)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not self._check_user_permission(update):
@@ -91,7 +153,7 @@ Supported exchanges: {}
             await update.message.reply_text("❌ Unauthorized access!")
             return
         
-        exchange_name = context.args[0] if context.args else list(self.exchanges.keys())[0]
+        exchange_name = context.args[0] if context.args else self._default_exchange_name
         
         if exchange_name not in self.exchanges:
             await update.message.reply_text(f"❌ Exchange {exchange_name} not configured")
@@ -99,17 +161,21 @@ Supported exchanges: {}
         
         try:
             exchange = self.exchanges[exchange_name]
-            balances = await exchange.get_balance()
+            balances = await self._cached((exchange_name, 'balance'), BALANCE_TTL, exchange.get_balance)
             
-            message = f"💰 **{exchange_name.upper()} Balance:**\\n\\n"
+            # Lines are collected and joined once rather than appended to one string
+            # Values are escaped for MarkdownV2; only the markup itself is left bare
+            parts = [f"💰 *{escape_md(exchange_name.upper())} Balance:*", ""]
             for balance in balances:
                 if balance.total > 0:
-                    message += f"`{balance.symbol}`: {balance.free:.6f} (Free) | {balance.used:.6f} (Used)\\n"
+                    parts.append(f"`{escape_md(balance.symbol)}`: " +
+                                 escape_md(f"{balance.free:.6f} (Free) | {balance.used:.6f} (Used)"))
             
-            if not any(b.total > 0 for b in balances):
-                message += "No balances found"
+            # Only the header means nothing was listed; no second scan of balances
+            if len(parts) == 2:
+                parts.append("No balances found")
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text("\n".join(parts), parse_mode=ParseMode.MARKDOWN_V2)
         except Exception as e:
             logger.error(f"Error fetching balance: {e}")
             await update.message.reply_text(f"❌ Error fetching balance: {str(e)}")
@@ -119,7 +185,7 @@ Supported exchanges: {}
             await update.message.reply_text("❌ Unauthorized access!")
             return
         
-        exchange_name = context.args[0] if context.args else list(self.exchanges.keys())[0]
+        exchange_name = context.args[0] if context.args else self._default_exchange_name
         
         if exchange_name not in self.exchanges:
             await update.message.reply_text(f"❌ Exchange {exchange_name} not configured")
@@ -127,21 +193,23 @@ Supported exchanges: {}
         
         try:
             exchange = self.exchanges[exchange_name]
-            positions = await exchange.get_positions()
+            positions = await self._cached((exchange_name, 'positions'), POSITIONS_TTL, exchange.get_positions)
             
-            message = f"📊 **{exchange_name.upper()} Positions:**\\n\\n"
+            parts = [f"📊 *{escape_md(exchange_name.upper())} Positions:*", ""]
             for position in positions:
                 pnl_emoji = "🟢" if position.unrealized_pnl >= 0 else "🔴"
-                message += f"{pnl_emoji} `{position.symbol}` ({position.side})\\n"
-                message += f"Size: {position.size:.6f}\\n"
-                message += f"Entry: ${position.entry_price:.4f}\\n"
-                message += f"PnL: ${position.unrealized_pnl:.2f} ({position.percentage:.2f}%)\\n"
-                message += f"Leverage: {position.leverage}x\\n\\n"
+                parts.append(f"{pnl_emoji} `{escape_md(position.symbol)}` {escape_md(f'({position.side})')}")
+                parts.append(escape_md(
+                    f"Size: {position.size:.6f}\n"
+                    f"Entry: ${position.entry_price:.4f}\n"
+                    f"PnL: ${position.unrealized_pnl:.2f} ({position.percentage:.2f}%)\n"
+                    f"Leverage: {position.leverage}x\n"
+                ))
             
             if not positions:
-                message += "No open positions"
+                parts.append("No open positions")
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text("\n".join(parts), parse_mode=ParseMode.MARKDOWN_V2)
         except Exception as e:
             logger.error(f"Error fetching positions: {e}")
             await update.message.reply_text(f"❌ Error fetching positions: {str(e)}")
@@ -151,7 +219,7 @@ Supported exchanges: {}
             await update.message.reply_text("❌ Unauthorized access!")
             return
         
-        exchange_name = context.args[0] if context.args else list(self.exchanges.keys())[0]
+        exchange_name = context.args[0] if context.args else self._default_exchange_name
         
         if exchange_name not in self.exchanges:
             await update.message.reply_text(f"❌ Exchange {exchange_name} not configured")
@@ -159,23 +227,24 @@ Supported exchanges: {}
         
         try:
             exchange = self.exchanges[exchange_name]
-            orders = await exchange.get_open_orders()
+            orders = await self._cached((exchange_name, 'orders'), ORDERS_TTL, exchange.get_open_orders)
             
-            message = f"📋 **{exchange_name.upper()} Open Orders:**\\n\\n"
+            parts = [f"📋 *{escape_md(exchange_name.upper())} Open Orders:*", ""]
             for order in orders:
-                side_emoji = "🟢" if order.side.value == "buy" else "🔴"
-                message += f"{side_emoji} `{order.symbol}` - {order.type.value.upper()}\\n"
-                message += f"Side: {order.side.value.upper()}\\n"
-                message += f"Amount: {order.amount:.6f}\\n"
+                side_emoji = "🟢" if order.side is OrderSide.BUY else "🔴"
+                parts.append(f"{side_emoji} `{escape_md(order.symbol)}` \\- {escape_md(order.type.value.upper())}")
+                parts.append(escape_md(f"Side: {order.side.value.upper()}"))
+                parts.append(escape_md(f"Amount: {order.amount:.6f}"))
                 if order.price:
-                    message += f"Price: ${order.price:.4f}\\n"
-                message += f"Status: {order.status.value}\\n"
-                message += f"ID: `{order.id}`\\n\\n"
+                    parts.append(escape_md(f"Price: ${order.price:.4f}"))
+                parts.append(escape_md(f"Status: {order.status.value}"))
+                parts.append(f"ID: `{escape_md(order.id)}`")
+                parts.append("")
             
             if not orders:
-                message += "No open orders"
+                parts.append("No open orders")
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text("\n".join(parts), parse_mode=ParseMode.MARKDOWN_V2)
         except Exception as e:
             logger.error(f"Error fetching orders: {e}")
             await update.message.reply_text(f"❌ Error fetching orders: {str(e)}")
@@ -219,25 +288,25 @@ Supported exchanges: {}
         
         try:
             exchange = self.exchanges[exchange_name]
-            from ..exchanges.base import OrderSide, OrderType
             
             order_side = OrderSide.BUY if side == "buy" else OrderSide.SELL
             order_type = OrderType.LIMIT if price else OrderType.MARKET
             
             order = await exchange.create_order(symbol, order_side, order_type, amount, price)
+            self._invalidate(exchange_name)
             
             side_emoji = "🟢" if side == "buy" else "🔴"
-            message = f"{side_emoji} **Order Placed!**\\n\\n"
-            message += f"Exchange: {exchange_name.upper()}\\n"
-            message += f"Symbol: `{symbol}`\\n"
-            message += f"Side: {side.upper()}\\n"
-            message += f"Amount: {amount}\\n"
+            message = f"{side_emoji} *Order Placed\\!*\n\n"
+            message += f"Exchange: {escape_md(exchange_name.upper())}\n"
+            message += f"Symbol: `{escape_md(symbol)}`\n"
+            message += f"Side: {side.upper()}\n"
+            message += f"Amount: {escape_md(amount)}\n"
             if price:
-                message += f"Price: ${price}\\n"
-            message += f"Type: {order_type.value.upper()}\\n"
-            message += f"Order ID: `{order.id}`\\n"
+                message += f"Price: ${escape_md(price)}\n"
+            message += f"Type: {order_type.value.upper()}\n"
+            message += f"Order ID: `{escape_md(order.id)}`\n"
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN_V2)
         except Exception as e:
             logger.error(f"Error placing order: {e}")
             await update.message.reply_text(f"❌ Error placing order: {str(e)}")
@@ -262,6 +331,7 @@ Supported exchanges: {}
         try:
             exchange = self.exchanges[exchange_name]
             success = await exchange.cancel_order(order_id, symbol)
+            self._invalidate(exchange_name)
             
             if success:
                 await update.message.reply_text(f"✅ Order `{order_id}` cancelled successfully")
@@ -289,15 +359,15 @@ Supported exchanges: {}
         
         try:
             exchange = self.exchanges[exchange_name]
-            ticker = await exchange.get_ticker(symbol)
+            ticker = await self._cached((exchange_name, 'ticker', symbol), TICKER_TTL,
+                                        lambda: exchange.get_ticker(symbol))
             
             change_emoji = "🟢" if ticker.change >= 0 else "🔴"
-            message = f"💲 **{symbol} Price on {exchange_name.upper()}:**\\n\\n"
-            message += f"{change_emoji} **${ticker.price:.4f}**\\n"
-            message += f"Change: {ticker.change:.2f}%\\n"
-            message += f"Volume: {ticker.volume:.2f}\\n"
+            message = f"💲 *{escape_md(symbol)} Price on {escape_md(exchange_name.upper())}:*\n\n"
+            message += f"{change_emoji} *${escape_md(f'{ticker.price:.4f}')}*\n"
+            message += escape_md(f"Change: {ticker.change:.2f}%\nVolume: {ticker.volume:.2f}\n")
             
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN_V2)
         except Exception as e:
             logger.error(f"Error fetching price: {e}")
             await update.message.reply_text(f"❌ Error fetching price: {str(e)}")
@@ -322,6 +392,7 @@ Supported exchanges: {}
         try:
             exchange = self.exchanges[exchange_name]
             success = await exchange.set_leverage(symbol, leverage)
+            self._invalidate(exchange_name)
             
             if success:
                 await update.message.reply_text(f"✅ Leverage for `{symbol}` set to {leverage}x")
@@ -337,19 +408,41 @@ Supported exchanges: {}
         await update.message.reply_text("❌ Unknown command. Use /help to see available commands.")
     
     async def send_notification(self, message: str):
-        if not self.chat_id:
+        if not self.chat_ids:
             logger.warning("No chat ID configured for notifications")
             return
         
-        try:
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(chat_id=self.chat_id, text=message, parse_mode=ParseMode.MARKDOWN)
-        except Exception as e:
-            logger.error(f"Error sending notification: {e}")
+        # Sent concurrently; the rate limiter spaces them out per chat
+        results = await asyncio.gather(
+            *[
+                self.app.bot.send_message(chat_id=chat_id, text=message, parse_mode=ParseMode.MARKDOWN)
+                for chat_id in self.chat_ids
+            ],
+            return_exceptions=True
+        )
+        for chat_id, result in zip(self.chat_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending notification to {chat_id}: {result}")
     
     def run(self):
         logger.info("Starting Telegram bot...")
-        self.app.run_polling()
+        self.app.run_polling(timeout=POLL_TIMEOUT, allowed_updates=ALLOWED_UPDATES)
+    
+    async def start_polling(self):
+        # Poll on the caller's event loop, e.g. next to the trading engine
+        logger.info("Starting Telegram bot...")
+        await self.app.initialize()
+        await self.app.start()
+        await self.app.updater.start_polling(timeout=POLL_TIMEOUT, allowed_updates=ALLOWED_UPDATES)
+    
+    async def stop(self):
+        if self.app.updater.running:
+            await self.app.updater.stop()
+        if self.app.running:
+            await self.app.stop()
+        await self.app.shutdown()
+        for exchange in self.exchanges.values():
+            await exchange.close()
     
     async def start_webhook(self, webhook_url: str):
         logger.info(f"Starting Telegram bot with webhook: {webhook_url}")
@@ -357,5 +450,6 @@ Supported exchanges: {}
         await self.app.updater.start_webhook(
             listen="0.0.0.0",
             port=8080,
-            webhook_url=webhook_url
+            webhook_url=webhook_url,
+            allowed_updates=ALLOWED_UPDATES
         )
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .logger import setup_logger, get_logger
+from .candle_cache import CandleCache
 from .data_fetcher import DataFetcher
 
-__all__ = ['setup_logger', 'get_logger', 'DataFetcher']
\ No newline at end of file
+__all__ = ['setup_logger', 'get_logger', 'CandleCache', 'DataFetcher']
\ No newline at end of file
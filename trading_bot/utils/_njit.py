@@ -0,0 +1,15 @@
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+    
+    def njit(*args, **kwargs):
+        # Allow both the bare ``@njit`` and the ``@njit(cache=True)`` forms
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        
+        def decorator(func):
+            return func
+        return decorator
+
+__all__ = ['njit', 'prange']
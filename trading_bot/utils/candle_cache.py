@@ -0,0 +1,92 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Tuple
+
+from ..strategies.base import MarketData
+
+# Closed candles persisted between runs so warm starts only fetch new bars.
+# Keyed by (exchange, symbol, timeframe, timestamp in ms). Alongside the candles
+# it records which time ranges were already fetched, so stretches where the
+# exchange has no candles (outages, before a listing) are not requested again.
+# Callers run it on worker threads; one lock serializes the shared connection.
+
+class CandleCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS candles ("
+            "exchange TEXT NOT NULL, symbol TEXT NOT NULL, timeframe TEXT NOT NULL, "
+            "timestamp INTEGER NOT NULL, open REAL, high REAL, low REAL, close REAL, volume REAL, "
+            "PRIMARY KEY (exchange, symbol, timeframe, timestamp)) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fetched_ranges ("
+            "exchange TEXT NOT NULL, symbol TEXT NOT NULL, timeframe TEXT NOT NULL, "
+            "range_start INTEGER NOT NULL, range_end INTEGER NOT NULL, "
+            "PRIMARY KEY (exchange, symbol, timeframe, range_start, range_end)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+    
+    @classmethod
+    def from_url(cls, url: str) -> "CandleCache":
+        if not url.startswith("sqlite:///"):
+            raise ValueError(f"Unsupported candle cache database: {url}")
+        return cls(url[len("sqlite:///"):])
+    
+    def load(self, exchange: str, symbol: str, timeframe: str,
+             start: datetime, end: datetime) -> List[MarketData]:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT timestamp, open, high, low, close, volume FROM candles "
+                "WHERE exchange = ? AND symbol = ? AND timeframe = ? AND timestamp BETWEEN ? AND ? "
+                "ORDER BY timestamp",
+                (exchange, symbol, timeframe, int(start.timestamp() * 1000), int(end.timestamp() * 1000))
+            ).fetchall()
+        return [
+            MarketData(symbol, datetime.fromtimestamp(row[0] / 1000), row[1], row[2], row[3], row[4], row[5])
+            for row in rows
+        ]
+    
+    def store(self, exchange: str, symbol: str, timeframe: str, candles: List[MarketData]):
+        if not candles:
+            return
+        rows = [
+            (exchange, symbol, timeframe, int(bar.timestamp.timestamp() * 1000),
+             bar.open, bar.high, bar.low, bar.close, bar.volume)
+            for bar in candles
+        ]
+        with self._lock:
+            self.connection.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+    
+    def load_fetched(self, exchange: str, symbol: str, timeframe: str,
+                     start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        # [start, end) ranges already fetched that overlap the window
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT range_start, range_end FROM fetched_ranges "
+                "WHERE exchange = ? AND symbol = ? AND timeframe = ? AND range_start < ? AND range_end > ? "
+                "ORDER BY range_start",
+                (exchange, symbol, timeframe, int(end.timestamp() * 1000), int(start.timestamp() * 1000))
+            ).fetchall()
+        fromtimestamp = datetime.fromtimestamp
+        return [(fromtimestamp(row[0] / 1000), fromtimestamp(row[1] / 1000)) for row in rows]
+    
+    def store_fetched(self, exchange: str, symbol: str, timeframe: str,
+                      ranges: List[Tuple[datetime, datetime]]):
+        if not ranges:
+            return
+        rows = [
+            (exchange, symbol, timeframe, int(start.timestamp() * 1000), int(end.timestamp() * 1000))
+            for start, end in ranges
+        ]
+        with self._lock:
+            self.connection.executemany("INSERT OR IGNORE INTO fetched_ranges VALUES (?, ?, ?, ?, ?)", rows)
+            self.connection.commit()
+    
+    def close(self):
+        with self._lock:
+            self.connection.close()
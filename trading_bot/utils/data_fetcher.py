@@ -1,50 +1,89 @@
 import ccxt
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import asyncio
+from operator import attrgetter
 from loguru import logger
 
 from ..strategies.base import MarketData
 from ..exchanges.base import BaseExchange
+from .candle_cache import CandleCache
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+# DataFrame price/volume column widths. talib and the njit kernels take doubles,
+# so float64 is the default; high_precision=False gives float32 columns at half
+# the memory for large multi-symbol pulls that are not fed to them directly
+PRICE_DTYPE = np.float64
+COMPACT_PRICE_DTYPE = np.float32
+# Candles requested per call when backfilling history, and calls in flight per symbol
+HISTORY_CHUNK = 1000
+HISTORY_CONCURRENCY = 5
+# Symbols backfilled at once; ccxt's rate limiter paces the requests themselves
+SYMBOL_CONCURRENCY = 20
 
 class DataFetcher:
-    def __init__(self, exchange: BaseExchange):
+    def __init__(self, exchange: BaseExchange, cache: Optional[CandleCache] = None):
         self.exchange = exchange
+        self.cache = cache
+        # Testnet and live candles differ, so they are cached separately
+        self.cache_key = f"{exchange.name}:testnet" if exchange.testnet else exchange.name
+    
+    @staticmethod
+    def to_market_data(symbol: str, ohlcv_data: List[List[float]]) -> List[MarketData]:
+        # Convert ccxt [timestamp, open, high, low, close, volume] rows to MarketData objects
+        fromtimestamp = datetime.fromtimestamp
+        return [
+            MarketData(symbol, fromtimestamp(candle[0] / 1000), float(candle[1]), float(candle[2]),
+                       float(candle[3]), float(candle[4]), float(candle[5]))
+            for candle in ohlcv_data
+        ]
+    
+    @staticmethod
+    def to_dataframe(symbol: str, ohlcv_data: List[List[float]],
+                     high_precision: bool = True) -> pd.DataFrame:
+        # Same rows as one float block indexed by local time, like MarketData
+        # timestamps; no per-candle objects besides the index datetimes.
+        # Parsed as float64 first since ms timestamps do not fit in float32
+        values = np.asarray(ohlcv_data, dtype=np.float64).reshape(-1, 6)
+        index = pd.DatetimeIndex([datetime.fromtimestamp(ms / 1000) for ms in values[:, 0].tolist()],
+                                 name='timestamp')
+        prices = values[:, 1:] if high_precision else values[:, 1:].astype(COMPACT_PRICE_DTYPE)
+        df = pd.DataFrame(prices, index=index, columns=OHLCV_COLUMNS, copy=False)
+        df.attrs['symbol'] = symbol
+        return df
+    
+    @staticmethod
+    def timeframe_span(timeframe: str) -> timedelta:
+        return timedelta(seconds=ccxt.Exchange.parse_timeframe(timeframe))
     
     async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', 
                          limit: int = 500, since: Optional[datetime] = None) -> List[MarketData]:
+        return self.to_market_data(symbol, await self._fetch_raw_ohlcv(symbol, timeframe, limit, since))
+    
+    async def fetch_ohlcv_df(self, symbol: str, timeframe: str = '1h',
+                             limit: int = 500, since: Optional[datetime] = None,
+                             high_precision: bool = True) -> pd.DataFrame:
+        # fetch_ohlcv for columnar consumers, skipping MarketData construction
+        rows = await self._fetch_raw_ohlcv(symbol, timeframe, limit, since)
+        return self.to_dataframe(symbol, rows, high_precision)
+    
+    async def _fetch_raw_ohlcv(self, symbol: str, timeframe: str, limit: int,
+                               since: Optional[datetime]) -> List[List[float]]:
         try:
             # Convert datetime to timestamp if provided
             since_timestamp = None
             if since:
                 since_timestamp = int(since.timestamp() * 1000)
             
-            # Fetch OHLCV data using ccxt
-            if hasattr(self.exchange, 'exchange') and hasattr(self.exchange.exchange, 'fetch_ohlcv'):
-                ohlcv_data = await asyncio.get_event_loop().run_in_executor(
-                    None, 
-                    self.exchange.exchange.fetch_ohlcv,
-                    symbol, timeframe, since_timestamp, limit
-                )
-            else:
+            # Fetch OHLCV data using the async ccxt client
+            fetch = getattr(self.exchange.market_data_client(), 'fetch_ohlcv', None)
+            if fetch is None:
                 raise NotImplementedError("Exchange does not support OHLCV data fetching")
+            ohlcv_data = await fetch(symbol, timeframe, since_timestamp, limit)
             
-            # Convert to MarketData objects
-            market_data = []
-            for candle in ohlcv_data:
-                timestamp, open_price, high, low, close, volume = candle
-                market_data.append(MarketData(
-                    symbol=symbol,
-                    timestamp=datetime.fromtimestamp(timestamp / 1000),
-                    open=float(open_price),
-                    high=float(high),
-                    low=float(low),
-                    close=float(close),
-                    volume=float(volume)
-                ))
-            
-            return market_data
+            return ohlcv_data
         
         except Exception as e:
             logger.error(f"Error fetching OHLCV data for {symbol}: {e}")
@@ -58,55 +97,103 @@ class DataFetcher:
         if end_date is None:
             end_date = datetime.now()
         
-        all_data = []
-        current_date = start_date
-        
-        # Fetch data in chunks to avoid rate limits
-        while current_date < end_date:
-            try:
-                chunk_data = await self.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    limit=1000,
-                    since=current_date
-                )
-                
-                if not chunk_data:
-                    break
-                
-                # Filter data within date range
-                filtered_data = [
-                    data for data in chunk_data
-                    if start_date <= data.timestamp <= end_date
-                ]
-                
-                all_data.extend(filtered_data)
-                
-                # Update current_date for next iteration
-                if chunk_data:
-                    current_date = chunk_data[-1].timestamp + timedelta(hours=1)
-                else:
+        span = self.timeframe_span(timeframe)
+        
+        # Serve whatever the cache holds and only fetch the ranges it is missing.
+        # SQLite calls run on a worker thread so they do not block the event loop
+        cached = []
+        fetched = []
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.load, self.cache_key, symbol, timeframe,
+                                             start_date, end_date)
+            fetched = await asyncio.to_thread(self.cache.load_fetched, self.cache_key, symbol, timeframe,
+                                              start_date, end_date)
+        all_data = list(cached)
+        fetched_from = len(all_data)
+        
+        # Split the missing ranges into chunks fetched concurrently
+        chunk_span = span * HISTORY_CHUNK
+        semaphore = asyncio.Semaphore(HISTORY_CONCURRENCY)
+        
+        async def fetch_chunk(chunk_start: datetime, chunk_end: datetime) -> List[MarketData]:
+            # Pages on within the chunk for exchanges that return fewer candles per call
+            candles = []
+            since = chunk_start
+            while since < chunk_end:
+                async with semaphore:
+                    page = await self.fetch_ohlcv(symbol=symbol, timeframe=timeframe,
+                                                  limit=HISTORY_CHUNK, since=since)
+                if not page or page[-1].timestamp + span <= since:
                     break
-                
-                # Add delay to respect rate limits
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                logger.error(f"Error fetching chunk starting from {current_date}: {e}")
-                break
-        
-        # Remove duplicates and sort by timestamp
-        unique_data = {}
-        for data in all_data:
-            key = (data.symbol, data.timestamp)
-            if key not in unique_data:
-                unique_data[key] = data
-        
-        sorted_data = sorted(unique_data.values(), key=lambda x: x.timestamp)
+                candles.extend(page)
+                since = page[-1].timestamp + span
+            return candles
+        
+        # No candle opens after now, so a window reaching into the future is cut
+        # there instead of paging on until the exchange returns nothing
+        fetch_end = min(end_date, datetime.now())
+        chunk_ranges = []
+        for gap_start, gap_end in self._missing_ranges(cached, fetched, start_date, fetch_end, span):
+            while gap_start < gap_end:
+                chunk_ranges.append((gap_start, min(gap_start + chunk_span, gap_end)))
+                gap_start += chunk_span
+        chunks = await asyncio.gather(
+            *[fetch_chunk(chunk_start, chunk_end) for chunk_start, chunk_end in chunk_ranges],
+            return_exceptions=True
+        )
+        
+        # Only closed candles are final; the one still forming is refetched
+        closed_until = datetime.now() - span
+        fetched_ranges = []
+        for (chunk_start, chunk_end), chunk in zip(chunk_ranges, chunks):
+            if isinstance(chunk, Exception):
+                logger.error(f"Error fetching chunk starting from {chunk_start}: {chunk}")
+                continue
+            if chunk_start < closed_until:
+                fetched_ranges.append((chunk_start, min(chunk_end, closed_until)))
+            # Filter data within date range
+            all_data.extend(data for data in chunk if start_date <= data.timestamp <= end_date)
+        
+        # Remove duplicates and sort by timestamp. Chunks arrive in order, so the
+        # list is nearly sorted and timsort is close to linear; the stable sort
+        # leaves duplicates adjacent with the first copy in front
+        sorted_data = []
+        last_timestamp = None
+        for data in sorted(all_data, key=attrgetter('timestamp')):
+            if data.timestamp != last_timestamp:
+                sorted_data.append(data)
+                last_timestamp = data.timestamp
+        
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.store, self.cache_key, symbol, timeframe, [
+                data for data in all_data[fetched_from:] if data.timestamp <= closed_until
+            ])
+            await asyncio.to_thread(self.cache.store_fetched, self.cache_key, symbol, timeframe,
+                                    fetched_ranges)
         
         logger.info(f"Fetched {len(sorted_data)} candles for {symbol} from {start_date} to {end_date}")
         return sorted_data
     
+    @staticmethod
+    def _missing_ranges(cached: List[MarketData], fetched: List[Tuple[datetime, datetime]],
+                        start_date: datetime, end_date: datetime,
+                        span: timedelta) -> List[Tuple[datetime, datetime]]:
+        # [start, end) stretches of the window covered neither by a cached candle
+        # nor by an earlier fetch, which also covers ranges where the exchange
+        # had no candles at all
+        covered = [(bar.timestamp, bar.timestamp + span) for bar in cached]
+        if fetched:
+            covered = sorted(covered + fetched)
+        ranges = []
+        cursor = start_date
+        for covered_start, covered_end in covered:
+            if covered_start - cursor >= span:
+                ranges.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end_date:
+            ranges.append((cursor, end_date))
+        return ranges
+    
     async def fetch_multiple_symbols(self, symbols: List[str], timeframe: str = '1h',
                                    start_date: datetime = None,
                                    end_date: datetime = None) -> Dict[str, List[MarketData]]:
@@ -114,7 +201,7 @@ class DataFetcher:
         result = {}
         
         # Fetch data for each symbol concurrently with semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(3)  # Limit to 3 concurrent requests
+        semaphore = asyncio.Semaphore(SYMBOL_CONCURRENCY)
         
         async def fetch_symbol_data(symbol: str):
             async with semaphore:
@@ -141,52 +228,59 @@ class DataFetcher:
             if isinstance(result_item, Exception):
                 logger.error(f"Task failed with exception: {result_item}")
                 continue
-                
+            
             symbol, data = result_item
             result[symbol] = data
         
         return result
     
-    def convert_to_dataframe(self, market_data: List[MarketData]) -> pd.DataFrame:
-        data_dict = {
-            'timestamp': [data.timestamp for data in market_data],
-            'open': [data.open for data in market_data],
-            'high': [data.high for data in market_data],
-            'low': [data.low for data in market_data],
-            'close': [data.close for data in market_data],
-            'volume': [data.volume for data in market_data]
-        }
-        
-        df = pd.DataFrame(data_dict)
-        df.set_index('timestamp', inplace=True)
-        return df
+    @staticmethod
+    def convert_to_dataframe(market_data: Union[List[MarketData], pd.DataFrame],
+                             high_precision: bool = True) -> pd.DataFrame:
+        dtype = PRICE_DTYPE if high_precision else COMPACT_PRICE_DTYPE
+        if isinstance(market_data, pd.DataFrame):
+            # Already columnar, e.g. from fetch_ohlcv_df; only narrowed on request
+            if high_precision:
+                return market_data
+            return market_data.astype(dict.fromkeys(OHLCV_COLUMNS, dtype), copy=False)
+        
+        # One (n, 5) float block filled straight from the bars, wrapped without
+        # copying; no per-row dicts or per-column type inference
+        values = np.fromiter(
+            ((bar.open, bar.high, bar.low, bar.close, bar.volume) for bar in market_data),
+            dtype=np.dtype((dtype, 5)), count=len(market_data)
+        )
+        index = pd.DatetimeIndex([bar.timestamp for bar in market_data], name='timestamp')
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS, copy=False)
     
     @staticmethod
-    def save_to_csv(market_data: List[MarketData], filename: str):
+    def save_to_csv(market_data: Union[List[MarketData], pd.DataFrame], filename: str):
         df = DataFetcher.convert_to_dataframe(market_data)
         df.to_csv(filename)
         logger.info(f"Saved {len(market_data)} records to {filename}")
     
     @staticmethod
-    def load_from_csv(filename: str, symbol: str) -> List[MarketData]:
+    def load_from_csv_df(filename: str, symbol: Optional[str] = None,
+                         high_precision: bool = True) -> pd.DataFrame:
+        # Column dtypes are declared up front instead of inferred per column
+        dtype = PRICE_DTYPE if high_precision else COMPACT_PRICE_DTYPE
         try:
-            df = pd.read_csv(filename, index_col='timestamp', parse_dates=True)
-            
-            market_data = []
-            for timestamp, row in df.iterrows():
-                market_data.append(MarketData(
-                    symbol=symbol,
-                    timestamp=timestamp,
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row['volume'])
-                ))
-            
-            logger.info(f"Loaded {len(market_data)} records from {filename}")
-            return market_data
+            df = pd.read_csv(filename, index_col='timestamp', parse_dates=True,
+                             dtype=dict.fromkeys(OHLCV_COLUMNS, dtype))
+            if symbol is not None:
+                df.attrs['symbol'] = symbol
             
+            logger.info(f"Loaded {len(df)} records from {filename}")
+            return df
+        
         except Exception as e:
             logger.error(f"Error loading data from {filename}: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    @staticmethod
+    def load_from_csv(filename: str, symbol: str) -> List[MarketData]:
+        df = DataFetcher.load_from_csv_df(filename, symbol)
+        return [
+            MarketData(symbol, timestamp, *values)
+            for timestamp, values in zip(df.index.to_pydatetime(), df[OHLCV_COLUMNS].to_numpy().tolist())
+        ]
\ No newline at end of file
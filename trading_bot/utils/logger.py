@@ -8,7 +8,8 @@ def setup_logger(
     log_file: Optional[str] = None,
     rotation: str = "1 day",
     retention: str = "30 days",
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    diagnose: bool = False
 ):
     # Remove default handler
     logger.remove()
@@ -29,7 +30,9 @@ def setup_logger(
         level=level,
         colorize=True,
         backtrace=True,
-        diagnose=True
+        # Variable values in tracebacks walk every frame of each logged
+        # exception, so they are opt-in for debugging
+        diagnose=diagnose
     )
     
     # Add file handler if specified
@@ -45,7 +48,10 @@ def setup_logger(
             retention=retention,
             compression="zip",
             backtrace=True,
-            diagnose=True
+            diagnose=diagnose,
+            # Writes, rotation and compression run on loguru's worker thread
+            # instead of blocking the event loop
+            enqueue=True
         )
     
     return logger